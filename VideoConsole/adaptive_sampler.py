@@ -0,0 +1,113 @@
+from frame_source import FrameSampler
+
+class AdaptiveSampler(FrameSampler):
+    """Sample sparsely while values are stable and bisect to find exact changes.
+
+    `read_values(frame_number, frame)` OCRs a frame and returns its region
+    values (e.g. {SelectionType: "12.50"}). Sampling starts `step` frames
+    apart and the stride grows by `growth` after every sample that matches
+    the previous one, up to `max_step`. When a sample differs, the interval
+    since the last matching sample is bisected until the first differing
+    frame is found (to within `min_step` frames), so each change costs about
+    log2(stride) extra OCR calls instead of dense sampling everywhere.
+    A value that comes and goes between two samples is never seen, so keep
+    `max_step` below the shortest-lived value that matters.
+
+    Yields (frame_number, values) for the first frame and every change.
+    Frames are read with the same grab/seek logic as FrameSampler; bisection
+    steps backwards, which always seeks. Seeks are verified (see
+    FrameSampler.set_position), but a capture with inexact seeks falls back to
+    grabbing from the start of the video for every backward step, so prefer
+    PyAV (exact timestamp seeks) for adaptive runs.
+    """
+
+    def __init__(self, video, start_frame, end_frame, read_values, step=15, max_step=240, min_step=1, growth=2.0,
+                 seek_mode="auto", probe_interval=100):
+        super().__init__(video, start_frame, end_frame, step, seek_mode, probe_interval)
+        self.read_values = read_values
+        self.max_step = max(self.step, max_step)
+        self.min_step = max(1, min_step)
+        self.growth = growth
+
+        self.position = start_frame
+        self.known = {}  # frame_number -> values, for samples not yet passed
+        self.ocr_calls = 0
+        self.changes = 0
+
+    def read(self, frame_number):
+        """Values at a frame, decoding and OCRing it unless it was already sampled"""
+        if frame_number in self.known:
+            return self.known[frame_number]
+
+        gap = frame_number - self.position
+        if gap < 0 or (gap > 0 and self.should_seek(gap)):
+            self.seek(frame_number)
+        elif gap > 0 and not self.skip(gap):
+            return None
+
+        if not self.video.grab():
+            return None
+        ret, frame = self.video.retrieve()
+        if not ret:
+            return None
+        self.retrieved += 1
+        self.samples_since_probe += 1
+        self.position = frame_number + 1
+
+        self.ocr_calls += 1
+        values = self.read_values(frame_number, frame)
+        self.known[frame_number] = values
+        return values
+
+    def find_change(self, low, high, low_values):
+        """Bisect (low, high] for the first frame whose values differ from low_values"""
+        high_values = self.known[high]
+        while high - low > self.min_step:
+            middle = (low + high) // 2
+            values = self.read(middle)
+            if values is None:
+                break
+            if values == low_values:
+                low = middle
+            else:
+                high, high_values = middle, values
+        return high, high_values
+
+    def __iter__(self):
+        self.set_position(self.start_frame)
+        self.position = self.start_frame
+
+        current = self.start_frame
+        current_values = self.read(current)
+        if current_values is None:
+            return
+        yield current, current_values
+
+        stride = self.step
+        while current < self.end_frame - 1:
+            # Never probe past a frame we've already sampled, so no known change is skipped
+            probe = min(current + int(stride), self.end_frame - 1)
+            later = [n for n in self.known if n > current]
+            if later:
+                probe = min(probe, min(later))
+
+            values = self.read(probe)
+            if values is None:
+                break
+
+            if values == current_values:
+                current = probe
+                stride = min(self.max_step, stride * self.growth)
+            else:
+                current, current_values = self.find_change(current, probe, current_values)
+                self.changes += 1
+                stride = self.step
+                yield current, current_values
+
+            # Samples at or before the current frame are no longer needed
+            self.known = {n: v for n, v in self.known.items() if n > current}
+
+    def summary(self):
+        return (f"{self.ocr_calls} frames OCR'd, {self.changes} changes located, "
+                f"{self.decoded} frames decoded ({self.grabbed} grab-only), {self.seeks} seeks "
+                f"({self.inexact_seeks} inexact)")
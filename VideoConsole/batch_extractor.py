@@ -0,0 +1,267 @@
+import argparse
+import os
+import time
+from datetime import timedelta
+
+import cv2
+
+from ocr_utils import OCRProcessor, BACKENDS
+from ocr_cache import OCRCache
+from data_handler import DataHandler
+from regions import SelectionType, crop_regions, load_regions
+from frame_source import FrameSampler, open_video
+from adaptive_sampler import AdaptiveSampler
+from ffmpeg_source import FFmpegRegionSource
+from change_detector import RegionChangeDetector
+from digit_recognizer import DigitRecognizer
+
+class BatchExtractor:
+    """Headless Credits/Bet/Win extraction over a whole video file.
+
+    Runs the same crop → OCR → clean → CSV pipeline as VideoTextPlayer's
+    auto processing, but without a GUI or a playback clock: frames are
+    decoded as fast as possible and crops from several sampled frames are
+    OCR'd in one batch.
+    """
+
+    def __init__(self, regions, ocr=None, data_handler=None, frame_step=15, batch_size=8, seek_mode="auto",
+                 change_detector=None, adaptive=False, max_step=240, decoder="cv2"):
+        self.regions = regions
+        self.ocr = ocr if ocr is not None else OCRProcessor()
+        self.data_handler = data_handler if data_handler is not None else DataHandler()
+        self.frame_step = max(1, frame_step)
+        self.batch_size = max(1, batch_size)
+        self.seek_mode = seek_mode
+        self.change_detector = change_detector
+        # Adaptive mode: grow the stride while values are stable and bisect to each change
+        self.adaptive = adaptive
+        self.max_step = max_step
+        # "cv2"/"pyav" decode full frames; "ffmpeg" crops the regions inside an ffmpeg subprocess
+        self.decoder = decoder
+
+        self.fps = 0
+        self.pending = []  # (frame_number, crops) waiting for the next OCR batch
+        self.frames_sampled = 0
+        self.rows_saved = 0
+
+    def wait_for_model(self):
+        """Block until the OCR model has finished loading"""
+        self.ocr.load_thread.join()
+        return self.ocr.model_loaded
+
+    def run(self, video_path, start_seconds=0, duration_seconds=None):
+        """Process a video and write one CSV row per valid sampled frame"""
+        if not os.path.isfile(video_path):
+            print(f"Error: Video file {video_path} not found")
+            return False
+
+        if self.decoder == "ffmpeg" and not self.adaptive and not FFmpegRegionSource.available():
+            print("Error: ffmpeg not found. Install it or set FFMPEG_CMD to its path")
+            return False
+
+        if not self.wait_for_model():
+            print("Error: TrOCR model could not be loaded")
+            return False
+
+        try:
+            video = open_video(video_path, "pyav" if self.decoder == "pyav" else "cv2")
+        except ImportError as e:
+            print(f"Error: {str(e)}")
+            return False
+        if not video.isOpened():
+            print(f"Error: Could not open video {video_path}")
+            return False
+
+        self.fps = video.get(cv2.CAP_PROP_FPS)
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        frame_size = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+        start_frame = int(self.fps * start_seconds)
+        end_frame = total_frames
+        if duration_seconds is not None:
+            end_frame = min(end_frame, start_frame + int(self.fps * duration_seconds))
+
+        print(f"Video FPS: {self.fps}")
+        if self.adaptive:
+            print(f"Processing frames {start_frame}-{end_frame}, adaptively every {self.frame_step}-{self.max_step} frames")
+        else:
+            print(f"Processing frames {start_frame}-{end_frame}, one frame every {self.frame_step} frames")
+        print(f"Writing results to {self.data_handler.csv_file}")
+
+        started = time.time()
+        if self.adaptive:
+            sampler = self.run_adaptive(video, start_frame, end_frame)
+        else:
+            if self.decoder == "ffmpeg":
+                sampler = FFmpegRegionSource(video_path, self.regions, frame_size, self.fps, start_frame, end_frame,
+                                             self.frame_step)
+                samples = iter(sampler)
+            else:
+                sampler = FrameSampler(video, start_frame, end_frame, self.frame_step, self.seek_mode)
+                samples = ((frame_number, crop_regions(frame, self.regions)) for frame_number, frame in sampler)
+
+            try:
+                for frame_number, crops in samples:
+                    if crops:
+                        # Crops are views into the decoded frame (or ffmpeg's buffer), so copy before queuing
+                        self.pending.append((frame_number, {key: crop.copy() for key, crop in crops.items()}))
+                        self.frames_sampled += 1
+
+                    if len(self.pending) >= self.batch_size:
+                        self.flush()
+            except RuntimeError as e:
+                # ffmpeg failed; keep the rows read so far but don't report success
+                self.flush()
+                self.data_handler.close()
+                video.release()
+                print(f"Error: {str(e)}")
+                return False
+
+            self.flush()
+        self.data_handler.close()
+        video.release()
+
+        elapsed = time.time() - started
+        rate = self.frames_sampled / elapsed if elapsed > 0 else 0
+        print(f"Processing complete. {self.frames_sampled} frames sampled, {self.rows_saved} rows saved "
+              f"in {elapsed:.1f}s ({rate:.1f} sampled frames/s)")
+        print(f"Decoding: {sampler.summary()}")
+        if self.change_detector is not None:
+            print(f"Change detection: {self.change_detector.summary()}")
+        if self.ocr.cache is not None:
+            print(f"OCR cache: {self.ocr.cache.summary()}")
+        if self.ocr.digit_recognizer is not None:
+            self.ocr.digit_recognizer.save()
+            print(f"Fast digit path: {self.ocr.digit_recognizer.summary()}")
+        return True
+
+    def read_values(self, frame_number, frame):
+        """OCR one frame's regions right away and return {SelectionType: cleaned value}"""
+        crops = crop_regions(frame, self.regions)
+        if self.change_detector is not None:
+            raw_texts = self.change_detector.extract_text_batch(self.ocr, crops)
+        else:
+            raw_texts = self.ocr.extract_text_batch(crops)
+
+        self.frames_sampled += 1
+        values = {}
+        for sel_type, raw_text in raw_texts.items():
+            cleaned_text = self.ocr.clean_numeric_text(raw_text) if raw_text else ""
+            if cleaned_text:
+                values[sel_type] = cleaned_text
+        return values
+
+    def run_adaptive(self, video, start_frame, end_frame):
+        """Save a row at the first frame and at every frame where a value changes"""
+        sampler = AdaptiveSampler(video, start_frame, end_frame, self.read_values, self.frame_step, self.max_step,
+                                  seek_mode=self.seek_mode)
+
+        for frame_number, values in sampler:
+            timestamp = timedelta(seconds=frame_number/self.fps)
+            if self.data_handler.save_to_csv(frame_number, timestamp, values, SelectionType):
+                self.rows_saved += 1
+            print(f"Frame {frame_number}: {', '.join(f'{k.name}={v}' for k, v in values.items()) or 'no values'}")
+        return sampler
+
+    def flush(self):
+        """OCR all pending crops in one batch and save the results in frame order"""
+        if not self.pending:
+            return
+
+        batch = {}
+        for frame_number, crops in self.pending:
+            for sel_type, crop in crops.items():
+                batch[(frame_number, sel_type)] = crop
+
+        if self.change_detector is not None:
+            # Keys are (frame_number, SelectionType); compare each region against its previous frame
+            raw_texts = self.change_detector.extract_text_batch(self.ocr, batch, region_of=lambda key: key[1])
+        else:
+            raw_texts = self.ocr.extract_text_batch(batch)
+
+        for frame_number, crops in self.pending:
+            results = {}
+            for sel_type in crops:
+                raw_text = raw_texts.get((frame_number, sel_type))
+                if raw_text:
+                    cleaned_text = self.ocr.clean_numeric_text(raw_text)
+                    if cleaned_text:
+                        results[sel_type] = cleaned_text
+
+            timestamp = timedelta(seconds=frame_number/self.fps)
+            if self.data_handler.save_to_csv(frame_number, timestamp, results, SelectionType):
+                self.rows_saved += 1
+
+        print(f"Processed up to frame {self.pending[-1][0]} ({self.frames_sampled} frames sampled, {self.rows_saved} rows saved)")
+        self.pending = []
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract Credits/Bet/Win values from a video without the GUI")
+    parser.add_argument("video_path", help="Path to the video file")
+    parser.add_argument("--regions", required=True, help="Region definition JSON saved from the Video Text Player")
+    parser.add_argument("--output", help="Output CSV file path (default: extracted_data_<timestamp>.csv)")
+    parser.add_argument("--step", type=int, default=15, help="Process one frame every N frames (default: 15)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Sampled frames per OCR batch (default: 8)")
+    parser.add_argument("--offset", type=float, default=0, help="Start at N seconds into the video (default: 0)")
+    parser.add_argument("--duration", type=float, help="Process only N seconds of video (default: whole file)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Start at --step, grow the stride while values are stable and bisect to the exact frame "
+                             "of each change (rows are saved only at changes; use with --decoder pyav for exact seeks)")
+    parser.add_argument("--max-step", type=int, default=240,
+                        help="Largest stride in --adaptive mode; values shorter-lived than this can be missed (default: 240)")
+    parser.add_argument("--decoder", choices=("cv2", "pyav", "ffmpeg"), default="cv2",
+                        help="Decode full frames with OpenCV or PyAV (threaded, exact seeks), or let an ffmpeg subprocess "
+                             "select and crop the regions so only the crops reach Python (default: cv2)")
+    parser.add_argument("--seek", choices=FrameSampler.SEEK_MODES, default="auto",
+                        help="Skip unsampled frames by grabbing, seeking, or whichever is cheaper (default: auto)")
+    parser.add_argument("--change-threshold", type=float, default=2.0,
+                        help="Reuse the previous text when a region's mean pixel difference is at most this (default: 2.0)")
+    parser.add_argument("--no-change-detection", action="store_true", help="OCR every sampled region")
+    parser.add_argument("--cache", default="ocr_cache.sqlite",
+                        help="OCR result cache shared across runs (default: ocr_cache.sqlite)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the OCR result cache")
+    parser.add_argument("--no-service", action="store_true",
+                        help="Always load the model in-process instead of using a running ocr_service.py")
+    parser.add_argument("--model", default="microsoft/trocr-base-printed",
+                        help="TrOCR model name (default: microsoft/trocr-base-printed)")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: the runtime's choice)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Use int8 dynamic quantization of the linear layers (torch backend)")
+    parser.add_argument("--fast-decode", action="store_true",
+                        help="Greedy decoding with a short token budget for numeric fields (see ocr_benchmark.py)")
+    parser.add_argument("--fast-digits", action="store_true",
+                        help="Read crops with a glyph template matcher learned from TrOCR output, "
+                             "using TrOCR only when it is unsure")
+    parser.add_argument("--digit-templates", default="digit_templates.npz",
+                        help="Where --fast-digits keeps its learned templates (default: digit_templates.npz)")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch",
+                        help="Run TrOCR with PyTorch or onnxruntime; onnx exports the model on first use (default: torch)")
+
+    args = parser.parse_args()
+    if args.adaptive and args.decoder == "ffmpeg":
+        parser.error("--adaptive needs random access and only works with --decoder cv2 or pyav")
+    if args.adaptive and args.decoder == "cv2":
+        print("Note: --adaptive seeks backwards a lot; --decoder pyav seeks exactly, "
+              "while inexact OpenCV seeks are corrected by slow grabbing")
+
+    regions = load_regions(args.regions)
+    change_detector = None if args.no_change_detection else RegionChangeDetector(args.change_threshold)
+    extractor = BatchExtractor(
+        regions,
+        ocr=OCRProcessor(args.model, cache=None if args.no_cache else OCRCache(args.cache),
+                         use_service=not args.no_service, num_threads=args.threads,
+                         quantize=args.quantize, fast_decode=args.fast_decode, backend=args.backend,
+                         digit_recognizer=DigitRecognizer(args.digit_templates) if args.fast_digits else None),
+        data_handler=DataHandler(args.output),
+        frame_step=args.step,
+        batch_size=args.batch_size,
+        seek_mode=args.seek,
+        change_detector=change_detector,
+        adaptive=args.adaptive,
+        max_step=args.max_step,
+        decoder=args.decoder
+    )
+    extractor.run(args.video_path, args.offset, args.duration)
+
+if __name__ == "__main__":
+    main()
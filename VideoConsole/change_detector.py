@@ -0,0 +1,106 @@
+import threading
+
+import cv2
+import numpy as np
+
+class RegionChangeDetector:
+    """Skip OCR on regions that haven't changed since they were last OCR'd.
+
+    Each region crop is reduced to a small grayscale thumbnail and compared to
+    the thumbnail of the last crop that was actually OCR'd for the same region.
+    If the mean absolute difference is at or below `threshold` (0-255 scale),
+    the previous text is reused instead of running OCR again.
+    """
+
+    def __init__(self, threshold=2.0, thumbnail_size=(32, 16), log_interval=100):
+        self.threshold = threshold
+        self.thumbnail_size = thumbnail_size
+        self.log_interval = log_interval
+
+        self.previous = {}  # region -> (thumbnail, text) of the last OCR'd crop
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def thumbnail(self, crop):
+        """Downscaled grayscale version of a crop used for comparison"""
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        small = cv2.resize(gray, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        return small.astype(np.int16)
+
+    def unchanged(self, thumbnail, previous_thumbnail):
+        """Check whether two thumbnails are within the change threshold"""
+        return np.abs(thumbnail - previous_thumbnail).mean() <= self.threshold
+
+    def extract_text_batch(self, ocr, crops, region_of=None):
+        """OCR only the crops whose region changed, reusing previous text for the rest.
+
+        `crops` is a dict like the one passed to OCRProcessor.extract_text_batch.
+        `region_of` maps a crop key to its region (default: the key itself), so
+        keys such as (frame_number, SelectionType) compare each frame against
+        the previous frame of the same SelectionType, in dict order.
+        """
+        to_run = {}
+        reuse = {}  # crop key -> text, or crop key -> ("pending", key run in this batch)
+        in_batch = {}  # region -> (thumbnail, key) for crops queued in this batch
+
+        for key, crop in crops.items():
+            region = region_of(key) if region_of else key
+            thumb = self.thumbnail(crop)
+
+            if region in in_batch:
+                previous_thumb, source_key = in_batch[region]
+                previous = (previous_thumb, ("pending", source_key))
+            else:
+                with self.lock:
+                    previous = self.previous.get(region)
+
+            if previous is not None and previous[0].shape == thumb.shape and self.unchanged(thumb, previous[0]):
+                reuse[key] = previous[1]
+                self.count(hit=True)
+            else:
+                to_run[key] = crop
+                in_batch[region] = (thumb, key)
+                self.count(hit=False)
+
+        texts = ocr.extract_text_batch(to_run) if to_run else {}
+
+        # Remember the newest OCR'd crop of each region (failed OCR is retried next time)
+        with self.lock:
+            for region, (thumb, key) in in_batch.items():
+                if texts.get(key) is not None:
+                    self.previous[region] = (thumb, texts[key])
+
+        results = {}
+        for key in crops:
+            if key in texts:
+                results[key] = texts[key]
+            else:
+                text = reuse[key]
+                if isinstance(text, tuple):
+                    text = texts.get(text[1])
+                results[key] = text
+        return results
+
+    def reset(self):
+        """Forget all remembered regions (e.g. after a seek or a new selection)"""
+        with self.lock:
+            self.previous.clear()
+
+    def count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            total = self.hits + self.misses
+
+        if self.log_interval and total % self.log_interval == 0:
+            print(f"Change detection: {self.summary()}")
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return f"{self.hits} OCR calls skipped, {self.misses} run ({self.hit_rate():.0%} unchanged)"
@@ -1,15 +1,172 @@
 import os
 import csv
-import pandas as pd
+import numpy as np
 from datetime import timedelta
 import time
+import threading
+import queue
+
+CSV_FIELDNAMES = ['Frame', 'Timestamp', 'Credits', 'Bet', 'Win']
+
+class BufferedCsvWriter:
+    """Long-lived CSV writer that keeps the file open and flushes in batches.
+    
+    Rows are flushed to disk every `flush_rows` rows or `flush_interval`
+    seconds, and on flush()/close(). With `background=True` rows are handed to
+    a writer thread so the caller (e.g. the Tk main thread) never touches disk.
+    """
+    
+    def __init__(self, path, fieldnames, flush_rows=50, flush_interval=2.0, background=False):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.background = background
+        
+        self.file = None
+        self.writer = None
+        self.pending_rows = 0
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+        
+        self.queue = None
+        self.thread = None
+        if background:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(target=self.run)
+            self.thread.daemon = True
+            self.thread.start()
+    
+    def open(self):
+        """Open the file once, writing the header if it's new or empty"""
+        write_header = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, 'a', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+        if write_header:
+            self.writer.writeheader()
+    
+    def write(self, row):
+        """Write (or hand off) one row"""
+        if self.background:
+            self.queue.put(("row", row))
+        else:
+            with self.lock:
+                self.write_row(row)
+    
+    def write_row(self, row):
+        if self.file is None:
+            self.open()
+        self.writer.writerow(row)
+        self.pending_rows += 1
+        
+        if self.pending_rows >= self.flush_rows or time.time() - self.last_flush >= self.flush_interval:
+            self.flush_file()
+    
+    def flush_file(self):
+        if self.file is not None:
+            self.file.flush()
+        self.pending_rows = 0
+        self.last_flush = time.time()
+    
+    def run(self):
+        """Background writer thread"""
+        while True:
+            try:
+                kind, value = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Flush rows that have been waiting longer than the interval
+                if self.pending_rows:
+                    self.flush_file()
+                continue
+                
+            try:
+                if kind == "row":
+                    self.write_row(value)
+                else:
+                    # Flush or close request: value is an Event the caller waits on
+                    self.flush_file()
+                    if kind == "close" and self.file is not None:
+                        self.file.close()
+                        self.file = None
+                    value.set()
+                    if kind == "close":
+                        return
+            except Exception as e:
+                print(f"Error writing CSV row: {e}")
+    
+    def flush(self):
+        """Write all buffered rows to disk"""
+        if self.background:
+            done = threading.Event()
+            self.queue.put(("flush", done))
+            done.wait()
+        else:
+            with self.lock:
+                self.flush_file()
+    
+    def close(self):
+        """Flush and close the file (and stop the writer thread)"""
+        if self.background:
+            if self.thread.is_alive():
+                done = threading.Event()
+                self.queue.put(("close", done))
+                done.wait()
+        else:
+            with self.lock:
+                self.flush_file()
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+
+class TimeSeries:
+    """Append-only, array-backed Frame/Credits/Bet/Win series for graphing.
+    
+    Values live in one preallocated float array that doubles in size when
+    full, so appends are amortized O(1) and reads are views without copying.
+    Values that aren't numbers are stored as NaN.
+    """
+    
+    COLUMNS = ('Frame', 'Credits', 'Bet', 'Win')
+    
+    def __init__(self, capacity=1024):
+        self.data = np.empty((capacity, len(self.COLUMNS)), dtype=np.float64)
+        self.length = 0
+    
+    def __len__(self):
+        return self.length
+    
+    def append(self, frame, credits, bet, win):
+        if self.length == len(self.data):
+            grown = np.empty((len(self.data) * 2, len(self.COLUMNS)), dtype=np.float64)
+            grown[:self.length] = self.data[:self.length]
+            self.data = grown
+            
+        self.data[self.length] = [self.to_number(v) for v in (frame, credits, bet, win)]
+        self.length += 1
+    
+    def to_number(self, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+    
+    def columns(self):
+        """Return {column: array view} for the rows written so far"""
+        return {name: self.data[:self.length, i] for i, name in enumerate(self.COLUMNS)}
 
 class DataHandler:
-    def __init__(self):
-        # Create a unique filename with timestamp
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        self.csv_file = f"extracted_data_{timestamp}.csv"
-        self.csv_header_written = False
+    def __init__(self, csv_file=None, background_writer=False):
+        # Create a unique filename with timestamp unless one was given
+        if csv_file is None:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            csv_file = f"extracted_data_{timestamp}.csv"
+        self.csv_file = csv_file
+        
+        # Keep the CSV open and write rows in batches instead of per-row open/close
+        self.writer = BufferedCsvWriter(self.csv_file, CSV_FIELDNAMES, background=background_writer)
+        
+        # In-memory copy of the saved rows so graphs never re-read the CSV
+        self.series = TimeSeries()
         
         # Store previous values as instance variables
         self.previous_credits = None
@@ -56,21 +213,20 @@ class DataHandler:
             'Win': results.get(selection_types.WIN, '')
         }
         
-        # Check if file exists to determine if we need to write the header
-        file_exists = os.path.isfile(self.csv_file)
-        
-        # Write to CSV
-        with open(self.csv_file, 'a', newline='') as csvfile:
-            fieldnames = ['Frame', 'Timestamp', 'Credits', 'Bet', 'Win']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-                
-            writer.writerow(row)
+        # Write to CSV (buffered; see BufferedCsvWriter)
+        self.writer.write(row)
+        self.series.append(row['Frame'], row['Credits'], row['Bet'], row['Win'])
         
         return True
     
+    def flush(self):
+        """Write any buffered rows to disk"""
+        self.writer.flush()
+    
+    def close(self):
+        """Flush and close the CSV file; call on shutdown"""
+        self.writer.close()
+    
     def validate_credit_changes(self, current_credits, current_bet, current_win):
         """Validate that credit changes follow expected patterns"""
         # If we don't have previous values, we can't validate
@@ -92,22 +248,8 @@ class DataHandler:
         return True
     
     def get_data_for_graph(self):
-        """Read the CSV file and return data for graphing"""
-        if not os.path.exists(self.csv_file):
+        """Return the saved rows as {column: array} for graphing, or None if there are none"""
+        if len(self.series) == 0:
             return None
             
-        try:
-            # Read the CSV file
-            df = pd.read_csv(self.csv_file)
-            
-            if len(df) == 0:
-                return None
-                
-            # Convert string values to numeric where possible
-            for col in ['Credits', 'Bet', 'Win']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-            return df
-        except Exception as e:
-            print(f"Error reading data for graph: {e}")
-            return None
+        return self.series.columns()
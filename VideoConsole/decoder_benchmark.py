@@ -0,0 +1,170 @@
+import argparse
+import csv
+import random
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import FrameSampler, open_video
+from pyav_capture import KeyframeSampler
+
+# (label, decoder, keyframes_only); keyframes-only is only timed for strided sampling
+CONFIGURATIONS = [
+    ("cv2", "cv2", False),
+    ("pyav", "pyav", False),
+    ("pyav-keyframes", "pyav", True)
+]
+
+def open_checked(video_path, decoder, keyframes_only=False):
+    video = open_video(video_path, decoder, keyframes_only)
+    if not video.isOpened():
+        raise IOError(f"Could not open video {video_path} with {decoder}")
+    return video
+
+def time_sequential(video_path, decoder, limit):
+    """Decode and convert up to `limit` frames in order; returns frames per second"""
+    video = open_checked(video_path, decoder)
+    try:
+        frames = 0
+        started = time.perf_counter()
+        while frames < limit:
+            ret, _ = video.read()
+            if not ret:
+                break
+            frames += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        video.release()
+    return frames / elapsed if elapsed > 0 else 0.0
+
+def time_strided(video_path, decoder, keyframes_only, step, seek_mode):
+    """Sample the whole video every `step` frames; returns (samples, seconds)"""
+    video = open_checked(video_path, decoder, keyframes_only)
+    try:
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if keyframes_only:
+            sampler = KeyframeSampler(video, 0, total_frames, step)
+        else:
+            sampler = FrameSampler(video, 0, total_frames, step, seek_mode)
+        started = time.perf_counter()
+        samples = sum(1 for _ in sampler)
+        elapsed = time.perf_counter() - started
+    finally:
+        video.release()
+    return samples, elapsed
+
+def reference_frames(video_path, decoder, targets):
+    """Frames at the (sorted) targets, found by decoding straight through without seeking"""
+    video = open_checked(video_path, decoder)
+    frames = {}
+    try:
+        position = 0
+        for target in sorted(set(targets)):
+            while position < target and video.grab():
+                position += 1
+            ret, frame = video.read()
+            if not ret:
+                break
+            frames[target] = frame
+            position += 1
+    finally:
+        video.release()
+    return frames
+
+def time_seeks(video_path, decoder, targets, references):
+    """Seek to each target in random order; returns (latencies, fraction landing on the right frame)"""
+    video = open_checked(video_path, decoder)
+    latencies = []
+    exact = 0
+    try:
+        for target in targets:
+            started = time.perf_counter()
+            video.set(cv2.CAP_PROP_POS_FRAMES, target)
+            ret, frame = video.read()
+            latencies.append(time.perf_counter() - started)
+            reference = references.get(target)
+            if ret and reference is not None and frame.shape == reference.shape:
+                # Same frame, allowing for tiny conversion differences
+                if np.abs(frame.astype(np.int16) - reference).mean() < 1.0:
+                    exact += 1
+    finally:
+        video.release()
+    checked = sum(1 for target in targets if target in references)
+    return np.array(latencies), (exact / checked if checked else 0.0)
+
+def benchmark_video(video_path, step, seeks, sequential_limit, seek_mode):
+    """Run every configuration on one video and return report rows"""
+    probe = open_checked(video_path, "cv2")
+    total_frames = int(probe.get(cv2.CAP_PROP_FRAME_COUNT))
+    probe.release()
+
+    # Same random targets for every decoder
+    rng = random.Random(0)
+    targets = [rng.randrange(max(1, total_frames - 1)) for _ in range(seeks)]
+
+    rows = []
+    for label, decoder, keyframes_only in CONFIGURATIONS:
+        try:
+            samples, seconds = time_strided(video_path, decoder, keyframes_only, step, seek_mode)
+            row = {
+                "video": video_path,
+                "decoder": label,
+                "strided_samples": samples,
+                "strided_seconds": round(seconds, 2),
+                "sequential_fps": "",
+                "seek_p50_ms": "",
+                "seek_p90_ms": "",
+                "seek_exact": ""
+            }
+            if not keyframes_only:
+                row["sequential_fps"] = round(time_sequential(video_path, decoder, sequential_limit), 1)
+                latencies, exact = time_seeks(video_path, decoder, targets,
+                                              reference_frames(video_path, decoder, targets))
+                p50, p90 = np.percentile(latencies, [50, 90]) * 1000
+                row["seek_p50_ms"] = round(p50, 1)
+                row["seek_p90_ms"] = round(p90, 1)
+                row["seek_exact"] = round(exact, 3)
+        except (IOError, ImportError) as e:
+            print(f"{label:<15} skipped: {str(e)}")
+            continue
+
+        rows.append(row)
+        line = f"{label:<15} strided: {row['strided_samples']} samples in {row['strided_seconds']:.2f} s"
+        if not keyframes_only:
+            line += (f"  sequential: {row['sequential_fps']:.1f} fps  seek p50 {row['seek_p50_ms']:.1f} ms  "
+                     f"p90 {row['seek_p90_ms']:.1f} ms  exact {row['seek_exact']:.0%}")
+        print(line)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare OpenCV and PyAV decoding: sequential speed, strided sampling, seek latency and accuracy")
+    parser.add_argument("videos", nargs="+", help="Sample video files")
+    parser.add_argument("--step", type=int, default=150, help="Frame step for strided sampling (default: 150)")
+    parser.add_argument("--seeks", type=int, default=30, help="Random seeks to time per decoder (default: 30)")
+    parser.add_argument("--sequential-frames", type=int, default=1000,
+                        help="Frames to decode for the sequential speed test (default: 1000)")
+    parser.add_argument("--seek", choices=FrameSampler.SEEK_MODES, default="auto",
+                        help="FrameSampler seek mode for strided sampling (default: auto)")
+    parser.add_argument("--output", help="Also write the report to this CSV file")
+
+    args = parser.parse_args()
+
+    rows = []
+    for video_path in args.videos:
+        print(f"{video_path}:")
+        try:
+            rows.extend(benchmark_video(video_path, max(1, args.step), args.seeks, args.sequential_frames, args.seek))
+        except IOError as e:
+            print(f"  skipped: {str(e)}")
+
+    if args.output and rows:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image
+
+class DigitRecognizer:
+    """Glyph template matcher for fixed-font meter displays.
+
+    Crops are binarized and split into glyphs at empty columns. Templates are
+    learned from crops the full OCR model has already read: when the model's
+    text (without spaces) has one character per glyph, each glyph is averaged
+    into that character's template. Once every glyph in a crop matches a
+    template closely and unambiguously, the crop is read here in well under a
+    millisecond and the model is skipped; otherwise recognize returns None and the caller
+    falls back to the model.
+
+    Glyphs are compared by the intersection over union of their ink, so the
+    background most of a glyph box is made of doesn't make different digits
+    look alike. A glyph whose closest character has fewer than `min_samples`
+    learned glyphs counts as having no template.
+    """
+
+    def __init__(self, path=None, glyph_size=16, min_samples=3, min_similarity=0.95, min_margin=0.05,
+                 min_glyph_pixels=2):
+        self.path = path
+        self.glyph_size = glyph_size
+        self.min_samples = min_samples
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.min_glyph_pixels = min_glyph_pixels
+
+        self.sums = {}  # character -> summed glyph vectors
+        self.counts = {}  # character -> number of glyphs summed
+        self.templates = None  # (characters, stacked templates), rebuilt after learning
+        self.lock = threading.Lock()
+
+        self.fast = 0
+        self.fallbacks = 0
+        self.learned = 0
+
+        if path and os.path.isfile(path):
+            self.load()
+
+    def segment(self, image):
+        """Split a crop into normalized glyph vectors, left to right"""
+        if isinstance(image, Image.Image):
+            gray = np.asarray(image.convert("L"))
+        elif image.ndim == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+
+        _, mask = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if mask.mean() > 0.5:
+            # Text is the minority class, whichever way round the display is
+            mask = 1 - mask
+
+        rows = np.flatnonzero(mask.any(axis=1))
+        if len(rows) == 0:
+            return np.empty((0, self.glyph_size * self.glyph_size), dtype=np.float32)
+
+        # Keep the full text line height so '.' and ',' stay at the baseline
+        line = mask[rows[0]:rows[-1] + 1]
+        height = line.shape[0]
+        columns = np.concatenate(([False], line.any(axis=0), [False]))
+        edges = np.flatnonzero(columns[1:] != columns[:-1])
+
+        glyphs = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            glyph = line[:, start:end]
+            if glyph.sum() < self.min_glyph_pixels:
+                continue
+            width = end - start
+            if width < height:
+                # Pad narrow glyphs to a square so '1' isn't stretched into a block
+                pad = height - width
+                glyph = np.pad(glyph, ((0, 0), (pad // 2, pad - pad // 2)))
+            glyph = cv2.resize(glyph.astype(np.float32), (self.glyph_size, self.glyph_size),
+                               interpolation=cv2.INTER_AREA)
+            glyphs.append(glyph.ravel())
+
+        if not glyphs:
+            return np.empty((0, self.glyph_size * self.glyph_size), dtype=np.float32)
+        return np.stack(glyphs)
+
+    def learn(self, image, text):
+        """Add a crop's glyphs to the templates if the text lines up with them"""
+        if not text:
+            return False
+        characters = [c for c in text if not c.isspace()]
+        glyphs = self.segment(image)
+        if len(characters) == 0 or len(characters) != len(glyphs):
+            return False
+
+        with self.lock:
+            for character, glyph in zip(characters, glyphs):
+                if character in self.sums:
+                    self.sums[character] += glyph
+                    self.counts[character] += 1
+                else:
+                    self.sums[character] = glyph.astype(np.float64)
+                    self.counts[character] = 1
+            self.templates = None
+            self.learned += 1
+        return True
+
+    def current_templates(self):
+        """Every learned character, its mean glyph and whether it has enough samples (call with the lock held)"""
+        if self.templates is None:
+            characters = list(self.counts.keys())
+            stacked = np.stack([self.sums[c] / self.counts[c] for c in characters]) if characters else None
+            ready = np.array([self.counts[c] >= self.min_samples for c in characters], dtype=bool)
+            self.templates = (characters, stacked, ready)
+        return self.templates
+
+    def recognize(self, image):
+        """Read a crop from the templates, or return None if any glyph is uncertain"""
+        glyphs = self.segment(image)
+
+        with self.lock:
+            characters, templates, ready = self.current_templates()
+            if len(glyphs) and ready.any():
+                # Similarity is the IoU of the ink (soft, since resized glyphs have gray edges), per glyph and template
+                overlap = np.minimum(glyphs[:, None, :], templates[None, :, :]).sum(axis=2)
+                union = np.maximum(glyphs[:, None, :], templates[None, :, :]).sum(axis=2)
+                similarity = overlap / np.maximum(union, 1e-6)
+                order = np.argsort(similarity, axis=1)
+                rows = np.arange(len(glyphs))
+                best = similarity[rows, order[:, -1]]
+                second = similarity[rows, order[:, -2]] if len(characters) > 1 else np.zeros(len(glyphs))
+
+                if (ready[order[:, -1]].all() and best.min() >= self.min_similarity
+                        and (best - second).min() >= self.min_margin):
+                    self.fast += 1
+                    return "".join(characters[i] for i in order[:, -1])
+
+            self.fallbacks += 1
+            return None
+
+    def load(self):
+        with np.load(self.path) as data:
+            if int(data["glyph_size"]) != self.glyph_size:
+                print(f"Ignoring digit templates in {self.path} (glyph size {int(data['glyph_size'])})")
+                return
+            for character, total, count in zip(data["characters"], data["sums"], data["counts"]):
+                self.sums[str(character)] = total
+                self.counts[str(character)] = int(count)
+        print(f"Loaded {len(self.counts)} digit templates from {self.path}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            if not self.sums:
+                return
+            characters = list(self.sums.keys())
+            # Through a file handle: given a path, np.savez appends ".npz" and load would never find it
+            with open(self.path, "wb") as f:
+                np.savez(
+                    f,
+                    glyph_size=self.glyph_size,
+                    characters=np.array(characters),
+                    sums=np.stack([self.sums[c] for c in characters]),
+                    counts=np.array([self.counts[c] for c in characters])
+                )
+
+    def fast_fraction(self):
+        total = self.fast + self.fallbacks
+        return self.fast / total if total else 0.0
+
+    def summary(self):
+        with self.lock:
+            known = int(self.current_templates()[2].sum())
+        return (f"{self.fast} of {self.fast + self.fallbacks} crops ({self.fast_fraction():.0%}) read by the "
+                f"digit recognizer, {self.learned} crops learned from, "
+                f"{known} characters known")
@@ -0,0 +1,162 @@
+import argparse
+import csv
+import os
+import time
+
+import cv2
+import numpy as np
+
+from ocr_engines import ENGINES, create_engine
+from regions import crop_regions, load_regions
+from frame_source import FrameSampler
+
+def load_crop_set(crops_dir):
+    """Return (filename, image) pairs for every image in a directory, sorted by name"""
+    crops = []
+    for filename in sorted(os.listdir(crops_dir)):
+        if os.path.splitext(filename)[1].lower() not in (".png", ".jpg", ".jpeg", ".bmp"):
+            continue
+        image = cv2.imread(os.path.join(crops_dir, filename))
+        if image is not None:
+            crops.append((filename, image))
+    return crops
+
+def load_labels(path):
+    """Read ground truth from a CSV with `filename,text` columns"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["filename"]: row["text"] for row in csv.DictReader(f)}
+
+def load_video_frames(video_path, step=150, limit=100, regions_path=None):
+    """Sample frames from a video (or their region crops) as (name, image) pairs"""
+    regions = load_regions(regions_path) if regions_path else None
+
+    video = cv2.VideoCapture(video_path)
+    if not video.isOpened():
+        raise IOError(f"Could not open video {video_path}")
+
+    images = []
+    try:
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        for frame_number, frame in FrameSampler(video, 0, total_frames, step):
+            if regions is None:
+                images.append((f"{frame_number:07d}", frame.copy()))
+            else:
+                for sel_type, crop in crop_regions(frame, regions).items():
+                    images.append((f"{frame_number:07d}_{sel_type.name}", crop.copy()))
+            if len(images) >= limit:
+                break
+    finally:
+        video.release()
+    return images[:limit]
+
+def normalize_text(text):
+    """Compare texts ignoring whitespace"""
+    return "".join((text or "").split())
+
+def benchmark_engine(name, images, batch_size):
+    """Load an engine and measure per-image latency, batch throughput and output texts"""
+    load_started = time.perf_counter()
+    engine = create_engine(name)
+    if not engine.load():
+        raise RuntimeError(f"OCR engine {name} could not be loaded")
+    load_seconds = time.perf_counter() - load_started
+
+    frames = [image for _, image in images]
+    # Warm up so lazy initialization doesn't count as latency
+    engine.recognize(frames[0])
+
+    latencies = []
+    texts = []
+    for frame in frames:
+        started = time.perf_counter()
+        result = engine.recognize(frame)
+        latencies.append(time.perf_counter() - started)
+        texts.append(result["text"])
+
+    started = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        engine.recognize_batch(frames[i:i + batch_size])
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "load_seconds": load_seconds,
+        "latencies": np.array(latencies),
+        "throughput": len(frames) / batch_seconds if batch_seconds > 0 else 0.0,
+        "texts": texts
+    }
+
+def agreement(texts, references):
+    """Fraction of images whose whitespace-normalized text matches the reference"""
+    if not references:
+        return 0.0
+    matches = sum(1 for text, reference in zip(texts, references) if normalize_text(text) == normalize_text(reference))
+    return matches / len(references)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run each OCR engine over the same frame set and compare throughput, latency and agreement")
+    parser.add_argument("source", help="Directory of images, or a video file to sample frames from")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES),
+                        help="Engines to compare (default: all registered)")
+    parser.add_argument("--regions", help="With a video source, benchmark the region crops instead of whole frames")
+    parser.add_argument("--step", type=int, default=150, help="Frame step when sampling a video (default: 150)")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum images to use (default: 100)")
+    parser.add_argument("--labels", help="CSV with filename,text ground truth (default: agreement with the first engine)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Images per recognize_batch call (default: 8)")
+    parser.add_argument("--output", help="Also write the report to this CSV file")
+
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        images = load_crop_set(args.source)[:args.limit]
+    else:
+        images = load_video_frames(args.source, args.step, args.limit, args.regions)
+    if not images:
+        print(f"Error: No images found in {args.source}")
+        return
+
+    references = None
+    if args.labels:
+        labels = load_labels(args.labels)
+        images = [(name, image) for name, image in images if name in labels]
+        references = [labels[name] for name, _ in images]
+        if not images:
+            print(f"Error: No labelled images in {args.source} match {args.labels}")
+            return
+        print(f"Using {len(images)} labelled images from {args.labels}")
+    else:
+        print(f"Agreement is measured against {args.engines[0]} ({len(images)} images)")
+
+    rows = []
+    for name in args.engines:
+        try:
+            result = benchmark_engine(name, images, max(1, args.batch_size))
+        except (RuntimeError, ImportError) as e:
+            print(f"{name:<12} skipped: {str(e)}")
+            continue
+        if references is None:
+            references = result["texts"]
+
+        p50, p90, p99 = np.percentile(result["latencies"], [50, 90, 99]) * 1000
+        row = {
+            "engine": name,
+            "images_per_second": round(result["throughput"], 1),
+            "p50_ms": round(p50, 1),
+            "p90_ms": round(p90, 1),
+            "p99_ms": round(p99, 1),
+            "agreement": round(agreement(result["texts"], references), 3),
+            "load_seconds": round(result["load_seconds"], 1)
+        }
+        rows.append(row)
+        print(f"{name:<12} {row['images_per_second']:>8.1f} images/s  p50 {row['p50_ms']:.1f} ms  "
+              f"p90 {row['p90_ms']:.1f} ms  p99 {row['p99_ms']:.1f} ms  agreement {row['agreement']:.1%}")
+
+    if args.output and rows:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
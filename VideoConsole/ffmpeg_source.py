@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Used when it exists; otherwise ffmpeg is looked up on the PATH
+FFMPEG_CMD = os.environ.get("FFMPEG_CMD", "ffmpeg")
+
+class FFmpegRegionSource:
+    """Decode with an ffmpeg subprocess that selects and crops before Python sees a frame.
+
+    ffmpeg keeps every `step`th frame (`select`), crops each region, pads the
+    crops to a common width and stacks them into one small tiled image per
+    sample. The tiles are streamed as raw bgr24 over a pipe with `readinto`
+    into one preallocated buffer, so each sample moves a few KB into Python
+    instead of a full frame, and decoding runs on ffmpeg's own threads.
+
+    Iterating yields (frame_number, {SelectionType: crop}). The crops are
+    views into the shared buffer and are overwritten by the next sample;
+    copy them if they need to live longer.
+    """
+
+    def __init__(self, video_path, regions, frame_size, fps, start_frame, end_frame, step, ffmpeg_cmd=FFMPEG_CMD):
+        self.video_path = video_path
+        self.fps = fps
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.step = max(1, step)
+        self.ffmpeg_cmd = ffmpeg_cmd
+
+        # Clamp regions to the frame like crop_regions does, and drop empty ones
+        frame_w, frame_h = frame_size
+        self.regions = {}
+        for sel_type, (x1, y1, x2, y2) in regions.items():
+            x1, x2 = max(0, min(x1, frame_w)), max(0, min(x2, frame_w))
+            y1, y2 = max(0, min(y1, frame_h)), max(0, min(y2, frame_h))
+            if x2 > x1 and y2 > y1:
+                self.regions[sel_type] = (x1, y1, x2, y2)
+        if not self.regions:
+            raise ValueError("No non-empty regions to decode")
+
+        # Layout of the tiled output: regions stacked top to bottom, left aligned
+        self.tile_width = max(x2 - x1 for x1, y1, x2, y2 in self.regions.values())
+        self.tiles = {}
+        top = 0
+        for sel_type, (x1, y1, x2, y2) in self.regions.items():
+            self.tiles[sel_type] = (top, top + y2 - y1, x2 - x1)
+            top += y2 - y1
+        self.buffer = np.empty((top, self.tile_width, 3), dtype=np.uint8)
+
+        self.samples = 0
+        self.bytes_read = 0
+
+    @staticmethod
+    def available(ffmpeg_cmd=FFMPEG_CMD):
+        return os.path.isfile(ffmpeg_cmd) or shutil.which(ffmpeg_cmd) is not None
+
+    def filter_graph(self):
+        """select every Nth frame, split per region, crop, pad to a common width and stack"""
+        count = len(self.regions)
+        # Convert before cropping: chroma-subsampled formats would round odd crop sizes and offsets
+        graph = [f"[0:v]select='not(mod(n\\,{self.step}))',format=bgr24" + (f",split={count}" if count > 1 else "") +
+                 "".join(f"[s{i}]" for i in range(count))]
+        for i, (x1, y1, x2, y2) in enumerate(self.regions.values()):
+            graph.append(f"[s{i}]crop={x2 - x1}:{y2 - y1}:{x1}:{y1},pad={self.tile_width}:ih:0:0[r{i}]")
+        if count > 1:
+            graph.append("".join(f"[r{i}]" for i in range(count)) + f"vstack=inputs={count}[out]")
+        else:
+            graph.append("[r0]null[out]")
+        return ";".join(graph)
+
+    def command(self):
+        samples = max(0, (self.end_frame - self.start_frame + self.step - 1) // self.step)
+        command = [self.ffmpeg_cmd, "-hide_banner", "-loglevel", "error", "-nostdin", "-threads", "0"]
+        if self.start_frame > 0:
+            # Input seeking; ffmpeg decodes from the previous keyframe and drops frames up to the start
+            command += ["-ss", f"{self.start_frame / self.fps:.6f}"]
+        command += [
+            "-i", self.video_path, "-an", "-sn", "-dn",
+            "-filter_complex", self.filter_graph(), "-map", "[out]",
+            # -vsync rather than -fps_mode, which only exists since ffmpeg 5.1
+            "-frames:v", str(samples), "-vsync", "passthrough",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"
+        ]
+        return command
+
+    def read_sample(self, pipe):
+        """Fill the buffer with one tiled sample; False at end of stream"""
+        view = memoryview(self.buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            count = pipe.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+        self.bytes_read += filled
+        return True
+
+    def __iter__(self):
+        # stderr goes to a file, not a pipe: a damaged file can log more warnings than a pipe
+        # holds, and ffmpeg would then block on stderr while we block on stdout
+        with tempfile.TemporaryFile() as log:
+            process = subprocess.Popen(self.command(), stdout=subprocess.PIPE, stderr=log,
+                                       bufsize=self.buffer.nbytes)
+            ended = False
+            try:
+                frame_number = self.start_frame
+                while frame_number < self.end_frame:
+                    if not self.read_sample(process.stdout):
+                        ended = True
+                        break
+                    self.samples += 1
+                    crops = {sel_type: self.buffer[top:bottom, :width]
+                             for sel_type, (top, bottom, width) in self.tiles.items()}
+                    yield frame_number, crops
+                    frame_number += self.step
+            finally:
+                process.stdout.close()
+                if not ended and process.poll() is None:
+                    process.kill()
+                process.wait()
+
+            log.seek(0)
+            error = log.read().decode("utf-8", "replace").strip()
+            if ended and process.returncode != 0:
+                # A failed run (bad option, unreadable file) must not look like an empty video
+                raise RuntimeError(f"ffmpeg exited with code {process.returncode}: {error[-2000:] or 'no output'}")
+            if error:
+                print(f"ffmpeg: {error[-2000:]}")
+
+    def summary(self):
+        per_sample = self.bytes_read / self.samples if self.samples else 0
+        return (f"{self.samples} frames sampled by ffmpeg, {self.bytes_read / 1024:.0f} KB read "
+                f"({per_sample / 1024:.1f} KB per sample)")
@@ -0,0 +1,191 @@
+import threading
+
+import cv2
+import numpy as np
+
+from frame_source import open_video
+
+class FramePrefetcher:
+    """Decoder thread that owns a VideoCapture and keeps a ring buffer of frames.
+
+    Frames are decoded ahead of the play head into preallocated arrays, and a
+    few frames behind it are kept so stepping back or scrubbing a short way is
+    served from memory. Readers never touch the capture, so playback, seeking
+    and OCR sampling don't contend for a lock around it.
+
+    Arrays returned by get_frame belong to the ring buffer: the decoder can
+    overwrite them once the play head is more than `history` frames past them,
+    or right away after a seek. Copy anything kept beyond the current call.
+
+    Frames the play head has left more than `history` frames behind are only
+    grabbed, never retrieved into the ring.
+    """
+
+    def __init__(self, video_path, memory_budget=256 * 1024 * 1024, history_fraction=0.25,
+                 min_capacity=8, max_capacity=120, seek_threshold=None, decoder="cv2"):
+        self.cap = open_video(video_path, decoder)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video {video_path}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        # Size the ring from a memory budget rather than a frame count
+        frame_bytes = max(self.width * self.height * 3, 1)
+        self.capacity = int(np.clip(memory_budget // frame_bytes, min_capacity, max_capacity))
+        self.history = max(1, int(self.capacity * history_fraction))
+        # Requests further ahead than this seek instead of decoding every frame in between
+        self.seek_threshold = seek_threshold if seek_threshold is not None else self.capacity
+        # Optional SeekIndex; with known keyframes, seeks start at the keyframe before the target
+        self.keyframe_index = None
+
+        self.slots = [np.empty((self.height, self.width, 3), dtype=np.uint8) for _ in range(self.capacity)]
+        self.slot_frames = [-1] * self.capacity  # frame number held by each slot
+
+        self.condition = threading.Condition()
+        self.head = 0  # frame most recently requested by a reader
+        self.next_decode = 0  # next frame the decoder thread will produce
+        self.seek_target = None
+        self.end_of_video = False
+        self.running = True
+
+        self.thread = threading.Thread(target=self.decode_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def has_frame(self, frame_number):
+        return self.slot_frames[frame_number % self.capacity] == frame_number
+
+    def decode_loop(self):
+        """Decode sequentially ahead of the play head until the ring is full"""
+        while True:
+            with self.condition:
+                while self.running and self.seek_target is None and (
+                        self.end_of_video or self.next_decode >= self.head - self.history + self.capacity):
+                    self.condition.wait()
+                if not self.running:
+                    return
+
+                if self.seek_target is not None:
+                    target = self.seek_target
+                    self.seek_target = None
+                    # Readers see the seek as in progress: not at the end, decoding from the target
+                    self.next_decode = target
+                    self.end_of_video = False
+                    keyframe = self.keyframe_before(target)
+                    if keyframe is not None:
+                        # Land exactly on the keyframe and decode forward; frames well before the
+                        # target are only grabbed, the last `history` ones fill the ring
+                        target = keyframe
+                else:
+                    target = None
+                    frame_number = self.next_decode
+                    # Frames further behind the play head than the kept history are never shown: grab only
+                    keep = frame_number >= self.head - self.history
+                    index = frame_number % self.capacity
+                    if keep:
+                        # The slot's old frame is behind the kept history, so nobody reads it any more
+                        self.slot_frames[index] = -1
+
+            if target is not None:
+                # Seeking can take a while; don't hold the lock that readers wait on
+                landed = self.set_position(target)
+                with self.condition:
+                    if self.seek_target is None:
+                        self.next_decode = landed
+                    # Otherwise a newer seek arrived meanwhile and is handled on the next pass
+                continue
+
+            # Decode outside the lock so readers of other slots aren't blocked
+            if keep:
+                ret, frame = self.cap.read(self.slots[index])
+            else:
+                ret, frame = self.cap.grab(), None
+
+            with self.condition:
+                if self.seek_target is not None:
+                    # A seek arrived while decoding; this frame is stale
+                    continue
+                if not ret:
+                    self.end_of_video = True
+                else:
+                    if keep:
+                        if frame is not self.slots[index]:
+                            # Decoder allocated a new array (unexpected size); keep it
+                            self.slots[index] = frame
+                        self.slot_frames[index] = frame_number
+                    self.next_decode = frame_number + 1
+                self.condition.notify_all()
+
+    def keyframe_before(self, frame_number):
+        if self.keyframe_index is None:
+            return None
+        return self.keyframe_index.keyframe_before(frame_number)
+
+    def set_position(self, frame_number):
+        """Seek the capture and return the frame its next read will produce.
+
+        Position-based seeks can land on the wrong frame. Like
+        FrameSampler.set_position, the landed position is checked and an
+        overshoot restarts from the beginning; the decode loop then grabs
+        forward from wherever the capture really is.
+        """
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        landed = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if landed > frame_number or landed < 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            landed = 0
+        return landed
+
+    def get_frame(self, frame_number, timeout=2.0):
+        """Return frame `frame_number` and make it the play head.
+
+        Served from the ring buffer when possible; otherwise the decoder seeks
+        (for far jumps) or decodes forward to it. Returns None past the end of
+        the video, and raises TimeoutError if the decoder hasn't produced the
+        frame within `timeout` seconds (a slow seek, say); the request stands,
+        so calling again keeps waiting for it.
+        """
+        if frame_number < 0 or (self.total_frames and frame_number >= self.total_frames):
+            return None
+
+        with self.condition:
+            self.head = frame_number
+
+            if not self.has_frame(frame_number):
+                behind = frame_number < self.next_decode
+                far_ahead = frame_number > self.next_decode + self.seek_threshold
+                keyframe = self.keyframe_before(frame_number)
+                if far_ahead and keyframe is not None and keyframe <= self.next_decode:
+                    # Same keyframe interval: a seek would decode from that keyframe again
+                    far_ahead = False
+                if behind or far_ahead:
+                    self.seek_target = frame_number
+                    for i in range(self.capacity):
+                        self.slot_frames[i] = -1
+
+            self.condition.notify_all()
+
+            if not self.condition.wait_for(
+                    lambda: self.has_frame(frame_number) or (self.end_of_video and self.seek_target is None),
+                    timeout):
+                raise TimeoutError(f"Frame {frame_number} was not decoded within {timeout:.1f}s")
+
+            if not self.has_frame(frame_number):
+                return None
+            return self.slots[frame_number % self.capacity]
+
+    def buffered_range(self):
+        """(first, last) frame numbers currently in the buffer, for diagnostics"""
+        with self.condition:
+            frames = [f for f in self.slot_frames if f >= 0]
+        return (min(frames), max(frames)) if frames else None
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=2.0)
+        self.cap.release()
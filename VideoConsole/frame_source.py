@@ -0,0 +1,155 @@
+import time
+
+import cv2
+
+DECODERS = ("cv2", "pyav")
+
+def open_video(video_path, decoder="cv2", keyframes_only=False):
+    """Open a video with OpenCV or PyAV; both return a cv2.VideoCapture-style object"""
+    if decoder == "pyav":
+        # Imported here so PyAV stays optional
+        from pyav_capture import PyAVCapture
+        return PyAVCapture(video_path, keyframes_only=keyframes_only)
+    if decoder != "cv2":
+        raise ValueError(f"Unknown decoder: {decoder}")
+    return cv2.VideoCapture(video_path)
+
+class FrameSampler:
+    """Yield every Nth frame of a cv2.VideoCapture without decoding the rest.
+
+    Skipped frames are only grabbed (demuxed and decoded into the capture's
+    internal buffer, never converted into a numpy image); sampled frames are
+    grabbed and retrieved. For large steps a seek can be cheaper than grabbing
+    every skipped frame, because the decoder only has to restart from the
+    nearest keyframe. In "auto" mode the sampler times both and uses whichever
+    is currently cheaper for the gap between samples.
+
+    Every seek is checked against the position the capture reports afterwards.
+    A seek that lands elsewhere is corrected by grabbing forward (from the
+    start of the video if it overshot), and "auto" mode stops seeking.
+    """
+
+    SEEK_MODES = ("auto", "grab", "seek")
+
+    def __init__(self, video, start_frame, end_frame, step, seek_mode="auto", probe_interval=100):
+        if seek_mode not in self.SEEK_MODES:
+            raise ValueError(f"Unknown seek mode: {seek_mode}")
+
+        self.video = video
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.step = max(1, step)
+        self.seek_mode = seek_mode
+        self.probe_interval = probe_interval
+
+        # Counters for reporting
+        self.grabbed = 0  # frames decoded but never converted
+        self.retrieved = 0  # frames decoded and handed to the caller
+        self.seeks = 0
+        self.inexact_seeks = 0
+
+        # Running cost estimates (seconds) for "auto" mode
+        self.grab_time = None
+        self.seek_time = None
+        self.samples_since_probe = 0
+
+    @property
+    def decoded(self):
+        """Number of frames the sampler explicitly decoded"""
+        return self.grabbed + self.retrieved
+
+    @property
+    def sampled(self):
+        """Number of frames yielded to the caller"""
+        return self.retrieved
+
+    def __iter__(self):
+        self.set_position(self.start_frame)
+        position = self.start_frame
+        next_sample = self.start_frame
+
+        while next_sample < self.end_frame:
+            gap = next_sample - position
+
+            if gap > 0:
+                if self.should_seek(gap):
+                    self.seek(next_sample)
+                elif not self.skip(gap):
+                    break
+                position = next_sample
+
+            if not self.video.grab():
+                break
+            ret, frame = self.video.retrieve()
+            if not ret:
+                break
+
+            self.retrieved += 1
+            self.samples_since_probe += 1
+            position += 1
+
+            yield next_sample, frame
+
+            next_sample += self.step
+
+    def should_seek(self, gap):
+        """Decide whether to seek or grab through a gap of skipped frames"""
+        if self.seek_mode == "grab":
+            return False
+        if self.seek_mode == "seek":
+            return True
+
+        # Auto: grab until we know what a grab costs, then probe a seek now and
+        # again so the estimate follows the content (keyframe spacing varies)
+        if self.grab_time is None or self.inexact_seeks:
+            return False
+        if self.seek_time is None or self.samples_since_probe >= self.probe_interval:
+            self.samples_since_probe = 0
+            return True
+        return self.seek_time < gap * self.grab_time
+
+    def skip(self, count):
+        """Grab (without retrieving) the next 'count' frames"""
+        started = time.perf_counter()
+        for grabbed in range(count):
+            if not self.video.grab():
+                self.grabbed += grabbed
+                return False
+        self.grabbed += count
+
+        per_grab = (time.perf_counter() - started) / count
+        self.grab_time = per_grab if self.grab_time is None else 0.8 * self.grab_time + 0.2 * per_grab
+        return True
+
+    def seek(self, frame_number):
+        """Seek straight to a frame (the decoder restarts from the previous keyframe)"""
+        started = time.perf_counter()
+        self.set_position(frame_number)
+        elapsed = time.perf_counter() - started
+
+        self.seek_time = elapsed if self.seek_time is None else 0.8 * self.seek_time + 0.2 * elapsed
+        self.seeks += 1
+
+    def set_position(self, frame_number):
+        """Position the capture so the next grab returns `frame_number`"""
+        self.video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+
+        # Position-based seeks can land on the wrong frame; check and grab the rest of the way
+        landed = int(self.video.get(cv2.CAP_PROP_POS_FRAMES))
+        if landed != frame_number:
+            if not self.inexact_seeks:
+                print(f"Seek to frame {frame_number} landed on {landed}; grabbing to the exact frame "
+                      f"(auto mode stops seeking)")
+            self.inexact_seeks += 1
+            if landed > frame_number or landed < 0:
+                self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                landed = 0
+            for _ in range(frame_number - landed):
+                if not self.video.grab():
+                    break
+                self.grabbed += 1
+
+    def summary(self):
+        """Describe how much decoding the sampling saved"""
+        return (f"{self.sampled} frames sampled, {self.decoded} frames decoded "
+                f"({self.grabbed} grab-only), {self.seeks} seeks ({self.inexact_seeks} inexact)")
@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import tkinter as tk
+import numpy as np
 
 class GraphView:
     def __init__(self, parent_frame):
@@ -35,7 +36,7 @@ class GraphView:
         self.initialize_graph()
     
     def initialize_graph(self):
-        """Initialize empty graphs"""
+        """Initialize empty graphs with persistent lines that updates only move"""
         # Credits graph
         self.credits_plot.clear()
         self.credits_plot.set_xlabel('Frame')
@@ -43,6 +44,8 @@ class GraphView:
         self.credits_plot.tick_params(axis='y', labelcolor='r')
         self.credits_plot.set_title('Credits Over Time')
         self.credits_plot.grid(True)
+        self.credits_line, = self.credits_plot.plot([], [], 'r-', label='Credits', animated=True)
+        self.credits_plot.legend(loc='upper left')
         self.credits_fig.tight_layout()
         
         # Bet and Win graph
@@ -51,56 +54,129 @@ class GraphView:
         self.bet_win_plot.set_ylabel('Value')
         self.bet_win_plot.set_title('Bet and Win Over Time')
         self.bet_win_plot.grid(True)
+        self.bet_line, = self.bet_win_plot.plot([], [], 'b-', label='Bet', animated=True)
+        self.win_line, = self.bet_win_plot.plot([], [], 'g-', label='Win', animated=True)
+        self.bet_win_plot.legend(loc='upper left')
         self.bet_win_fig.tight_layout()
         
+        # (axes, canvas, lines) for each graph, plus the background saved for blitting
+        self.graphs = [
+            (self.credits_plot, self.credits_canvas, [self.credits_line]),
+            (self.bet_win_plot, self.bet_win_canvas, [self.bet_line, self.win_line]),
+        ]
+        self.backgrounds = {}
+        
+        # Re-capture the static background after every full draw (including window resizes)
+        for axes, canvas, lines in self.graphs:
+            canvas.mpl_connect('draw_event', lambda event, a=axes, c=canvas, l=lines: self.on_draw(a, c, l))
+        
         # Draw both canvases
         self.credits_canvas.draw()
         self.bet_win_canvas.draw()
     
-    def update_graph(self, data_df):
-        """Update both graphs with data from the dataframe"""
-        if data_df is None or len(data_df) == 0:
-            return "No data to graph yet."
+    def on_draw(self, axes, canvas, lines):
+        """Save the axes background and draw the animated lines on top of it"""
+        self.backgrounds[axes] = canvas.copy_from_bbox(axes.bbox)
+        for line in lines:
+            axes.draw_artist(line)
+    
+    def decimate(self, x, y, columns):
+        """Reduce a series to its min and max per pixel column.
+        
+        Keeps the visible envelope of the line (spikes such as short-lived
+        wins survive) while drawing at most 2 points per pixel column.
+        """
+        valid = ~np.isnan(y)
+        x = x[valid]
+        y = y[valid]
+        
+        # Rows arrive in processing order, which isn't frame order after a backwards seek or a manual extract
+        if np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x = x[order]
+            y = y[order]
+        if len(x) <= 2 * columns:
+            return x, y
             
-        try:
-            # Clear both plots
-            self.credits_plot.clear()
-            self.bet_win_plot.clear()
+        # Sorted by frame, so each pixel column is a contiguous slice
+        edges = np.linspace(x[0], x[-1], columns + 1)
+        starts = np.unique(np.searchsorted(x, edges[:-1], side='left'))
+        starts = starts[starts < len(x)]
+        
+        min_y = np.minimum.reduceat(y, starts)
+        max_y = np.maximum.reduceat(y, starts)
+        
+        # Place the min and max at the start and end of their column
+        ends = np.append(starts[1:], len(x)) - 1
+        out_x = np.empty(2 * len(starts))
+        out_y = np.empty(2 * len(starts))
+        out_x[0::2] = x[starts]
+        out_x[1::2] = x[ends]
+        out_y[0::2] = min_y
+        out_y[1::2] = max_y
+        return out_x, out_y
+    
+    def expand_limits(self, axes, x, series):
+        """Grow the axis limits (with headroom) when data falls outside them.
+        
+        Returns True when the limits changed and a full redraw is needed.
+        """
+        values = np.concatenate([y[~np.isnan(y)] for y in series]) if series else np.array([])
+        if len(x) == 0 or len(values) == 0:
+            return False
             
-            # Plot Credits on the first graph
-            if not data_df['Credits'].isna().all():
-                self.credits_plot.plot(data_df['Frame'], data_df['Credits'], 'r-', label='Credits')
-                self.credits_plot.set_xlabel('Frame')
-                self.credits_plot.set_ylabel('Credits', color='r')
-                self.credits_plot.set_title('Credits Over Time')
-                self.credits_plot.grid(True)
-                self.credits_plot.legend(loc='upper left')
+        x_min, x_max = axes.get_xlim()
+        y_min, y_max = axes.get_ylim()
+        data_x_min, data_x_max = x.min(), x.max()
+        data_y_min, data_y_max = values.min(), values.max()
+        
+        changed = False
+        # set_xlim turns autoscaling off, so it's only still on before the first data
+        first_data = axes.get_autoscalex_on()
+        
+        if first_data or data_x_min < x_min or data_x_max > x_max:
+            span = max(data_x_max - data_x_min, 1.0)
+            axes.set_xlim(data_x_min, data_x_max + span * 0.25)
+            changed = True
             
-            # Plot Bet and Win on the second graph
-            has_bet_or_win = False
+        if first_data or data_y_min < y_min or data_y_max > y_max:
+            span = max(data_y_max - data_y_min, abs(data_y_max) * 0.1, 1.0)
+            axes.set_ylim(data_y_min - span * 0.1, data_y_max + span * 0.1)
+            changed = True
             
-            if not data_df['Bet'].isna().all():
-                self.bet_win_plot.plot(data_df['Frame'], data_df['Bet'], 'b-', label='Bet')
-                has_bet_or_win = True
-                
-            if not data_df['Win'].isna().all():
-                self.bet_win_plot.plot(data_df['Frame'], data_df['Win'], 'g-', label='Win')
-                has_bet_or_win = True
+        return changed
+    
+    def update_graph(self, data):
+        """Update both graphs with {column: array} data from DataHandler.get_data_for_graph"""
+        if data is None or len(data['Frame']) == 0:
+            return "No data to graph yet."
             
-            if has_bet_or_win:
-                self.bet_win_plot.set_xlabel('Frame')
-                self.bet_win_plot.set_ylabel('Value')
-                self.bet_win_plot.set_title('Bet and Win Over Time')
-                self.bet_win_plot.grid(True)
-                self.bet_win_plot.legend(loc='upper left')
+        try:
+            frames = data['Frame']
+            series = {
+                self.credits_line: data['Credits'],
+                self.bet_line: data['Bet'],
+                self.win_line: data['Win'],
+            }
             
-            # Adjust layout and redraw both canvases
-            self.credits_fig.tight_layout()
-            self.bet_win_fig.tight_layout()
-            self.credits_canvas.draw()
-            self.bet_win_canvas.draw()
+            for axes, canvas, lines in self.graphs:
+                # Decimate to the axes' width in pixels so drawing cost doesn't grow with the session
+                columns = max(int(axes.bbox.width), 1)
+                for line in lines:
+                    line.set_data(*self.decimate(frames, series[line], columns))
+                
+                if self.expand_limits(axes, frames, [series[line] for line in lines]) or axes not in self.backgrounds:
+                    # Limits changed: relayout and do a full draw (on_draw re-captures the background)
+                    axes.figure.tight_layout()
+                    canvas.draw()
+                else:
+                    # Blit: restore the static background and redraw only the lines
+                    canvas.restore_region(self.backgrounds[axes])
+                    for line in lines:
+                        axes.draw_artist(line)
+                    canvas.blit(axes.bbox)
             
-            return f"Graphs updated with {len(data_df)} data points."
+            return f"Graphs updated with {len(frames)} data points."
             
         except Exception as e:
             error_msg = f"Error updating graphs: {str(e)}"
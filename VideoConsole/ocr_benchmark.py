@@ -0,0 +1,167 @@
+import argparse
+import csv
+import os
+import time
+
+import cv2
+
+from ocr_utils import OCRProcessor, FAST_DECODE_KWARGS
+from regions import crop_regions, load_regions
+from frame_source import FrameSampler
+from engine_benchmark import load_crop_set, load_labels
+
+# (name, OCRProcessor keyword arguments, generate kwargs overriding the processor's defaults)
+CONFIGURATIONS = [
+    ("baseline", {}, None),
+    ("greedy", {}, {"num_beams": 1, "do_sample": False, "max_new_tokens": 50}),
+    ("fast-decode", {"fast_decode": True}, None),
+    ("fast-decode+int8", {"fast_decode": True, "quantize": True}, None),
+    ("onnx+fast-decode", {"fast_decode": True, "backend": "onnx"}, None),
+]
+
+def save_crop_set(video_path, regions_path, out_dir, step=150, limit=200):
+    """Dump region crops from a video as PNGs to build a fixed benchmark set"""
+    regions = load_regions(regions_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    video = cv2.VideoCapture(video_path)
+    if not video.isOpened():
+        raise IOError(f"Could not open video {video_path}")
+
+    saved = 0
+    try:
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        for frame_number, frame in FrameSampler(video, 0, total_frames, step):
+            for sel_type, crop in crop_regions(frame, regions).items():
+                cv2.imwrite(os.path.join(out_dir, f"{frame_number:07d}_{sel_type.name}.png"), crop)
+                saved += 1
+            if saved >= limit:
+                break
+    finally:
+        video.release()
+
+    print(f"Saved {saved} crops to {out_dir}")
+
+def time_model(ocr, images, batch_size, repeat):
+    """Average seconds per crop over `repeat` passes, running `batch_size` crops per generate call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(images), batch_size):
+            ocr.run_model(images[i:i + batch_size])
+    return (time.perf_counter() - started) / (repeat * len(images))
+
+def benchmark_configuration(model_name, kwargs, generate_kwargs, crops, threads, batch_size, repeat):
+    """Load one configuration and measure its latency and output on the crop set"""
+    load_started = time.perf_counter()
+    ocr = OCRProcessor(model_name, use_service=False, num_threads=threads, **kwargs)
+    ocr.load_thread.join()
+    if not ocr.model_loaded:
+        raise RuntimeError(f"Could not load model {model_name}")
+    if generate_kwargs is not None:
+        ocr.generate_kwargs = dict(generate_kwargs)
+    load_seconds = time.perf_counter() - load_started
+
+    images = [ocr.to_pil_image(image) for _, image in crops]
+    # Warm up so one-time allocations don't count against the first configuration
+    ocr.run_model(images[:batch_size])
+
+    texts = []
+    for i in range(0, len(images), batch_size):
+        texts.extend(ocr.run_model(images[i:i + batch_size]))
+
+    return {
+        "ocr": ocr,
+        "load_seconds": load_seconds,
+        "single": time_model(ocr, images, 1, repeat),
+        "batched": time_model(ocr, images, batch_size, repeat),
+        "texts": texts
+    }
+
+def numeric_accuracy(ocr, texts, references):
+    """Fraction of crops whose cleaned numeric value matches the reference"""
+    if not references:
+        return 0.0
+    matches = sum(1 for text, reference in zip(texts, references)
+                  if ocr.clean_numeric_text(text) == ocr.clean_numeric_text(reference))
+    return matches / len(references)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare TrOCR inference settings on a fixed crop set (accuracy vs per-crop latency)")
+    parser.add_argument("crops_dir", help="Directory of region crop images")
+    parser.add_argument("--labels", help="CSV with filename,text ground truth (default: <crops_dir>/labels.csv "
+                                         "if present, otherwise the baseline output is the reference)")
+    parser.add_argument("--video", help="First dump crops from this video into crops_dir (needs --regions)")
+    parser.add_argument("--regions", help="Region definition JSON used with --video")
+    parser.add_argument("--step", type=int, default=150, help="Frame step when dumping crops (default: 150)")
+    parser.add_argument("--limit", type=int, default=200, help="Maximum crops to dump (default: 200)")
+    parser.add_argument("--model", default="microsoft/trocr-base-printed",
+                        help="TrOCR model name (default: microsoft/trocr-base-printed)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[None],
+                        help="Intra-op thread counts to try (default: the runtime's choice)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Crops per generate call when batched (default: 8)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the crop set (default: 3)")
+    parser.add_argument("--output", help="Also write the report to this CSV file")
+
+    args = parser.parse_args()
+
+    if args.video:
+        if not args.regions:
+            parser.error("--video needs --regions")
+        save_crop_set(args.video, args.regions, args.crops_dir, args.step, args.limit)
+
+    crops = load_crop_set(args.crops_dir)
+    if not crops:
+        print(f"Error: No images found in {args.crops_dir}")
+        return
+
+    labels_path = args.labels or os.path.join(args.crops_dir, "labels.csv")
+    labels = load_labels(labels_path) if os.path.isfile(labels_path) else None
+    if labels is not None:
+        crops = [(filename, image) for filename, image in crops if filename in labels]
+        print(f"Using {len(crops)} labelled crops from {labels_path}")
+    else:
+        print(f"No labels found; accuracy is agreement with the baseline configuration ({len(crops)} crops)")
+
+    print(f"Fast decode settings: {FAST_DECODE_KWARGS}")
+
+    rows = []
+    references = [labels[filename] for filename, _ in crops] if labels is not None else None
+    baseline_single = None
+    for threads in args.threads:
+        for name, kwargs, generate_kwargs in CONFIGURATIONS:
+            try:
+                result = benchmark_configuration(args.model, kwargs, generate_kwargs, crops, threads,
+                                                 args.batch_size, args.repeat)
+            except RuntimeError as e:
+                # e.g. the onnx backend without optimum installed
+                print(f"{name:<18} skipped: {str(e)}")
+                continue
+            if references is None:
+                references = result["texts"]
+            if baseline_single is None:
+                baseline_single = result["single"]
+
+            row = {
+                "configuration": name,
+                "threads": threads or "default",
+                "ms_per_crop": round(result["single"] * 1000, 1),
+                "ms_per_crop_batched": round(result["batched"] * 1000, 1),
+                "speedup": round(baseline_single / result["single"], 2),
+                "accuracy": round(numeric_accuracy(result["ocr"], result["texts"], references), 3),
+                "load_seconds": round(result["load_seconds"], 1)
+            }
+            rows.append(row)
+            print(f"{name:<18} threads={row['threads']:<8} {row['ms_per_crop']:>8.1f} ms/crop "
+                  f"{row['ms_per_crop_batched']:>8.1f} ms/crop batched  {row['speedup']:>5.2f}x  "
+                  f"accuracy {row['accuracy']:.1%}")
+
+    if args.output and rows:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+class OCRCache:
+    """Disk-backed OCR result cache shared across runs.
+
+    Results are keyed by a hash of the image pixels plus a namespace that
+    identifies the engine, model and decode parameters, so changing any of
+    those never returns stale text. Entries are evicted least recently used
+    first once the cache holds more than `max_entries` results.
+
+    Hits only read; their last-used times are kept in memory and written in
+    the next put's transaction (or every `touch_interval` hits, and on close),
+    so lookups from several processes don't queue on SQLite's writer lock.
+    """
+
+    def __init__(self, path="ocr_cache.sqlite", max_entries=500000, evict_interval=1000, touch_interval=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_interval = evict_interval
+        self.puts_since_evict = 0
+        self.touch_interval = touch_interval
+        self.touched = {}  # key -> last_used not yet written
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        # timeout lets worker processes share one cache file
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.connection.commit()
+
+    def make_key(self, image, namespace):
+        """Hash an OpenCV or PIL image together with the cache namespace"""
+        digest = hashlib.sha1(namespace.encode("utf-8"))
+        if isinstance(image, Image.Image):
+            digest.update(f"{image.mode}{image.size}".encode("utf-8"))
+            digest.update(image.tobytes())
+        else:
+            image = np.ascontiguousarray(image)
+            digest.update(f"{image.dtype}{image.shape}".encode("utf-8"))
+            digest.update(image.data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached value for a key, or None"""
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.touched[key] = time.time()
+            if len(self.touched) >= self.touch_interval:
+                self.flush_touched()
+                self.connection.commit()
+            return json.loads(row[0])
+
+    def put(self, key, value):
+        """Store a JSON-serializable value, evicting old entries if the cache is full"""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self.touched.pop(key, None)
+            self.flush_touched()
+            # Counting rows is a table scan, so only check the size every so often
+            self.puts_since_evict += 1
+            if self.puts_since_evict >= self.evict_interval:
+                self.puts_since_evict = 0
+                self.evict()
+            self.connection.commit()
+
+    def flush_touched(self):
+        """Write pending last-used times in the current transaction (caller commits)"""
+        if not self.touched:
+            return
+        self.connection.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                    [(used, key) for key, used in self.touched.items()])
+        self.touched = {}
+
+    def evict(self):
+        """Drop the least recently used 10% once the entry limit is exceeded"""
+        count = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        excess = count - self.max_entries + self.max_entries // 10
+        self.connection.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"{self.hits} cache hits, {self.misses} misses ({rate:.0%} hit rate)"
+
+    def close(self):
+        with self.lock:
+            self.flush_touched()
+            self.connection.commit()
+            self.connection.close()
@@ -0,0 +1,219 @@
+import os
+import threading
+
+import cv2
+from PIL import Image
+
+# Used when it exists; otherwise pytesseract looks for `tesseract` on the PATH
+DEFAULT_TESSERACT_CMD = os.environ.get("TESSERACT_CMD", r'C:\Program Files\Tesseract-OCR\tesseract.exe')
+
+# Characters the meter regions can contain
+NUMERIC_WHITELIST = "0123456789.,$"
+
+ENGINES = {}
+
+def register_engine(name):
+    """Class decorator that adds an OCREngine subclass to the registry under `name`"""
+    def register(cls):
+        cls.name = name
+        ENGINES[name] = cls
+        return cls
+    return register
+
+def create_engine(name, **options):
+    """Instantiate a registered engine; options go to its constructor"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown OCR engine: {name} (available: {', '.join(sorted(ENGINES))})")
+    return ENGINES[name](**options)
+
+class OCREngine:
+    """Common interface for OCR backends.
+
+    recognize(image) returns a dict:
+
+      - "text": the recognized text ("" if none)
+      - "conf": confidence 0-100, or None if the engine doesn't report one
+      - "words": [{"text", "conf", "x", "y", "w", "h"}, ...] for engines that
+        locate text (supports_boxes), otherwise empty
+
+    Images are OpenCV (BGR) arrays. Subclasses implement recognize or
+    recognize_batch (the default of each calls the other).
+    """
+
+    name = None
+    supports_boxes = False
+
+    def load(self):
+        """Block until the engine is ready; return False if it can't run"""
+        return True
+
+    def cache_namespace(self):
+        """Identify the engine and its settings for OCRCache keys"""
+        return self.name
+
+    def recognize(self, image):
+        return self.recognize_batch([image])[0]
+
+    def recognize_batch(self, images):
+        return [self.recognize(image) for image in images]
+
+@register_engine("tesseract")
+class TesseractEngine(OCREngine):
+    """pytesseract image_to_data, with word boxes and confidences"""
+
+    supports_boxes = True
+
+    def __init__(self, cmd=DEFAULT_TESSERACT_CMD, config=""):
+        import pytesseract
+
+        self.pytesseract = pytesseract
+        self.cmd = cmd
+        self.config = config
+        self.version = None
+
+    def load(self):
+        if self.cmd and os.path.isfile(self.cmd):
+            self.pytesseract.pytesseract.tesseract_cmd = self.cmd
+
+        try:
+            self.version = self.pytesseract.get_tesseract_version()
+        except self.pytesseract.TesseractNotFoundError:
+            print("Error: Tesseract OCR not found. Please install it and ensure it's in your PATH.")
+            print("Installation guide: https://github.com/tesseract-ocr/tesseract")
+            return False
+        return True
+
+    def cache_namespace(self):
+        return f"tesseract:{self.version}:words:{self.config}"
+
+    def recognize(self, image):
+        data = self.pytesseract.image_to_data(image, config=self.config, output_type=self.pytesseract.Output.DICT)
+
+        words = []
+        for i in range(len(data['text'])):
+            # Skip empty text
+            if not data['text'][i].strip():
+                continue
+
+            words.append({
+                'text': data['text'][i],
+                'conf': data['conf'][i],
+                'x': data['left'][i],
+                'y': data['top'][i],
+                'w': data['width'][i],
+                'h': data['height'][i]
+            })
+
+        # Tesseract reports -1 for boxes it didn't recognize
+        confidences = [float(word['conf']) for word in words if float(word['conf']) >= 0]
+        return {
+            "text": " ".join(word['text'] for word in words),
+            "conf": sum(confidences) / len(confidences) if confidences else None,
+            "words": words
+        }
+
+@register_engine("tesseract-line")
+class TesseractLineEngine(OCREngine):
+    """Tesseract on a single-line region crop, restricted to a character whitelist.
+
+    Uses an in-process tesserocr API handle kept open between calls when
+    tesserocr is installed, so there is no subprocess, temp file or page
+    layout analysis per crop. Falls back to pytesseract.image_to_string
+    with the same page segmentation mode and whitelist otherwise.
+    """
+
+    def __init__(self, psm=7, whitelist=NUMERIC_WHITELIST, min_height=32, cmd=DEFAULT_TESSERACT_CMD):
+        self.psm = psm
+        self.whitelist = whitelist
+        # Tesseract reads small text poorly; shorter crops are upscaled to this height
+        self.min_height = min_height
+        self.cmd = cmd
+
+        self.api = None
+        self.pytesseract = None
+        self.version = None
+        # A tesserocr handle must not be used from two threads at once
+        self.api_lock = threading.Lock()
+
+    def load(self):
+        try:
+            import tesserocr
+
+            self.api = tesserocr.PyTessBaseAPI(psm=self.psm)
+            if self.whitelist:
+                self.api.SetVariable("tessedit_char_whitelist", self.whitelist)
+            self.version = tesserocr.tesseract_version().split()[1]
+            return True
+        except ImportError:
+            pass
+        except RuntimeError as e:
+            # tesserocr is installed but couldn't find its language data
+            print(f"tesserocr unavailable ({str(e)}), using pytesseract")
+
+        import pytesseract
+
+        self.pytesseract = pytesseract
+        if self.cmd and os.path.isfile(self.cmd):
+            pytesseract.pytesseract.tesseract_cmd = self.cmd
+        try:
+            self.version = pytesseract.get_tesseract_version()
+        except pytesseract.TesseractNotFoundError:
+            print("Error: Tesseract OCR not found. Please install it (or tesserocr) and ensure it's in your PATH.")
+            return False
+        return True
+
+    def config(self):
+        config = f"--psm {self.psm}"
+        if self.whitelist:
+            config += f" -c tessedit_char_whitelist={self.whitelist}"
+        return config
+
+    def cache_namespace(self):
+        return f"tesseract:{self.version}:line:{self.config()}:{self.min_height}"
+
+    def prepare(self, image):
+        """Grayscale and upscale a crop to a height Tesseract reads reliably"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        if 0 < gray.shape[0] < self.min_height:
+            scale = self.min_height / gray.shape[0]
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        return gray
+
+    def recognize(self, image):
+        gray = self.prepare(image)
+
+        if self.api is not None:
+            with self.api_lock:
+                self.api.SetImage(Image.fromarray(gray))
+                text = self.api.GetUTF8Text().strip()
+                conf = self.api.MeanTextConf()
+            return {"text": text, "conf": float(conf) if text else None, "words": []}
+
+        text = self.pytesseract.image_to_string(gray, config=self.config()).strip()
+        return {"text": text, "conf": None, "words": []}
+
+    def close(self):
+        if self.api is not None:
+            self.api.End()
+            self.api = None
+
+@register_engine("trocr")
+class TrOCREngine(OCREngine):
+    """TrOCR through OCRProcessor (single text line per image, no boxes or confidence)"""
+
+    def __init__(self, model_name="microsoft/trocr-base-printed", **options):
+        # Imported here so Tesseract-only setups don't need transformers
+        from ocr_utils import OCRProcessor
+
+        self.ocr = OCRProcessor(model_name, **options)
+
+    def load(self):
+        self.ocr.load_thread.join()
+        return self.ocr.model_loaded
+
+    def cache_namespace(self):
+        return self.ocr.cache_namespace()
+
+    def recognize_batch(self, images):
+        texts = self.ocr.extract_text_batch(images)
+        return [{"text": text or "", "conf": None, "words": []} for text in texts]
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import deque
+
+class OCRPipeline:
+    """Bounded producer/consumer queue between playback and OCR.
+
+    Each work item carries its own frame number and region crops, so a slow
+    consumer can never process a frame number against a newer image. When the
+    queue is full the drop policy decides what happens:
+
+      - "drop-oldest": discard the oldest waiting item
+      - "block": make the producer wait for a free slot (nothing is lost)
+      - "coalesce": replace the newest waiting item, so the backlog stays
+        fixed and the most recent frame is always processed
+
+    Each consumer takes up to `batch_size` waiting items at once and passes
+    them to the handler as a list of (frame_number, *payload) tuples; the
+    handler returns one result per item, so it can OCR them in a single model
+    call. Several consumer threads may run the handler; results are still
+    passed to `on_result` in submission order (dropped items are skipped).
+    """
+
+    POLICIES = ("drop-oldest", "block", "coalesce")
+
+    def __init__(self, handler, on_result=None, maxsize=8, policy="drop-oldest", workers=1, batch_size=1):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown drop policy: {policy}")
+
+        self.handler = handler
+        self.on_result = on_result
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.batch_size = max(1, batch_size)
+
+        self.items = deque()  # (sequence, frame_number, payload, submitted_at)
+        self.condition = threading.Condition()
+        self.running = True
+
+        # In-order delivery of results from several consumers
+        self.next_sequence = 0
+        self.next_to_emit = 0
+        self.finished = {}  # sequence -> (frame_number, result, submitted_at), or None if dropped
+        self.emit_lock = threading.Lock()
+
+        # Counters for the status bar
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.in_progress = 0
+        self.average_latency = 0.0
+        self.max_latency = 0.0
+
+        self.workers = []
+        for _ in range(max(1, workers)):
+            worker = threading.Thread(target=self.consume)
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    def submit(self, frame_number, *payload):
+        """Queue a frame's work, applying the drop policy if the queue is full"""
+        with self.condition:
+            if not self.running:
+                return
+
+            sequence = self.next_sequence
+            self.next_sequence += 1
+            self.submitted += 1
+            item = (sequence, frame_number, payload, time.perf_counter())
+
+            if len(self.items) >= self.maxsize:
+                if self.policy == "block":
+                    while self.running and len(self.items) >= self.maxsize:
+                        self.condition.wait()
+                    if not self.running:
+                        # Stopped while waiting for a slot
+                        self.drop(item)
+                        return
+                elif self.policy == "drop-oldest":
+                    self.drop(self.items.popleft())
+                else:
+                    self.drop(self.items.pop())
+
+            self.items.append(item)
+            self.condition.notify_all()
+
+    def drop(self, item):
+        """Record a discarded item so in-order delivery skips it"""
+        self.dropped += 1
+        self.finish(item[0], None)
+
+    def consume(self):
+        """Consumer thread: run the handler on batches of queued items until stopped"""
+        while True:
+            with self.condition:
+                while self.running and not self.items:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                batch = [self.items.popleft() for _ in range(min(self.batch_size, len(self.items)))]
+                self.in_progress += len(batch)
+                self.condition.notify_all()
+
+            try:
+                results = self.handler([(frame_number, *payload) for _, frame_number, payload, _ in batch])
+            except Exception as e:
+                print(f"Error processing frames {batch[0][1]}-{batch[-1][1]}: {str(e)}")
+                results = [None] * len(batch)
+
+            with self.condition:
+                self.in_progress -= len(batch)
+                self.processed += len(batch)
+            for (sequence, frame_number, _, submitted_at), result in zip(batch, results):
+                self.finish(sequence, (frame_number, result, submitted_at))
+
+    def finish(self, sequence, outcome):
+        """Store a finished item and emit every result that is now in order.
+
+        Delivery happens under `emit_lock`, so a consumer that drained result N
+        can't be overtaken by another consumer delivering N+1 first.
+        """
+        with self.emit_lock:
+            self.finished[sequence] = outcome
+            while self.next_to_emit in self.finished:
+                ready = self.finished.pop(self.next_to_emit)
+                self.next_to_emit += 1
+                if ready is None:
+                    continue
+                frame_number, result, submitted_at = ready
+
+                latency = time.perf_counter() - submitted_at
+                self.average_latency = 0.9 * self.average_latency + 0.1 * latency if self.average_latency else latency
+                self.max_latency = max(self.max_latency, latency)
+
+                if self.on_result is not None and result is not None:
+                    self.on_result(frame_number, result)
+
+    def depth(self):
+        with self.condition:
+            return len(self.items)
+
+    def status_text(self):
+        """One-line summary of queue depth, latency and drops"""
+        return (f"OCR queue {self.depth()}/{self.maxsize} ({self.in_progress} running) | "
+                f"latency {self.average_latency * 1000:.0f} ms (max {self.max_latency * 1000:.0f}) | "
+                f"{self.processed} done, {self.dropped} dropped")
+
+    def clear(self):
+        """Discard all waiting items (e.g. after a seek)"""
+        with self.condition:
+            while self.items:
+                self.drop(self.items.popleft())
+            self.condition.notify_all()
+
+    def stop(self):
+        """Stop the consumers; waiting items are discarded"""
+        self.clear()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
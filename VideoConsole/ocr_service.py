@@ -0,0 +1,152 @@
+import argparse
+import base64
+import io
+import json
+import os
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+from PIL import Image
+
+DEFAULT_SERVICE_URL = os.environ.get("OCR_SERVICE_URL", "http://127.0.0.1:8765")
+
+def encode_image(image):
+    """PNG-encode an OpenCV (BGR) or PIL image as base64 text"""
+    if isinstance(image, Image.Image):
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="PNG")
+        data = buffer.getvalue()
+    else:
+        ok, encoded = cv2.imencode(".png", image)
+        if not ok:
+            raise ValueError("Could not encode image")
+        data = encoded.tobytes()
+    return base64.b64encode(data).decode("ascii")
+
+def decode_image(text):
+    """Decode base64 PNG text to a PIL RGB image"""
+    return Image.open(io.BytesIO(base64.b64decode(text))).convert("RGB")
+
+class OCRServiceClient:
+    """Client for the warm OCR service (see OCRService)"""
+
+    def __init__(self, url=DEFAULT_SERVICE_URL, timeout=60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, path, payload=None, timeout=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def available(self, namespace):
+        """Check whether the service is running with the same model and settings.
+
+        `namespace` is OCRProcessor.cache_namespace(), which covers the model,
+        weight precision and decode parameters.
+        """
+        try:
+            health = self.request("/health", timeout=0.5)
+        except (OSError, ValueError):
+            return False
+        return health.get("loaded") and health.get("namespace") == namespace
+
+    def extract_text_batch(self, images):
+        """OCR a list of images in one request; returns a list of texts"""
+        response = self.request("/ocr", {"images": [encode_image(image) for image in images]})
+        return response["texts"]
+
+class OCRService:
+    """Local HTTP service that keeps one TrOCR model loaded between runs.
+
+    POST /ocr takes {"images": [base64 PNG, ...]} and returns {"texts": [...]}
+    from a single batched generate pass; GET /health reports the model.
+    """
+
+    def __init__(self, model_name="microsoft/trocr-base-printed", host="127.0.0.1", port=8765,
+                 num_threads=None, quantize=False, fast_decode=False, backend="torch"):
+        # Imported here so clients don't pull in transformers
+        from ocr_utils import OCRProcessor
+
+        self.ocr = OCRProcessor(model_name, use_service=False, num_threads=num_threads,
+                                quantize=quantize, fast_decode=fast_decode, backend=backend)
+        self.ocr.load_thread.join()
+        if not self.ocr.model_loaded:
+            raise RuntimeError(f"Could not load model {model_name}")
+
+        # One generate call at a time; requests from several clients queue here
+        self.model_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.make_handler())
+
+    def make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def send_json(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self.send_json(200, {"model": service.ocr.model_name,
+                                         "namespace": service.ocr.cache_namespace(),
+                                         "loaded": service.ocr.model_loaded})
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/ocr":
+                    self.send_json(404, {"error": "not found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    request = json.loads(self.rfile.read(length).decode("utf-8"))
+                    images = [decode_image(text) for text in request["images"]]
+                    with service.model_lock:
+                        texts = service.ocr.run_model(images) if images else []
+                    self.send_json(200, {"texts": texts})
+                except Exception as e:
+                    self.send_json(500, {"error": str(e)})
+
+            def log_message(self, format, *args):
+                # Keep the console quiet; one line per request is too noisy for batch runs
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        host, port = self.server.server_address[:2]
+        print(f"OCR service for {self.ocr.model_name} listening on http://{host}:{port}")
+        self.server.serve_forever()
+
+def main():
+    # Imported here like in OCRService: ocr_utils imports this module for OCRServiceClient
+    from ocr_utils import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Keep a TrOCR model loaded and serve OCR requests on localhost")
+    parser.add_argument("--model", default="microsoft/trocr-base-printed",
+                        help="Model name to use (default: microsoft/trocr-base-printed)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: the runtime's choice)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Use int8 dynamic quantization of the linear layers (torch backend)")
+    parser.add_argument("--fast-decode", action="store_true",
+                        help="Greedy decoding with a short token budget for numeric fields")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch",
+                        help="Run the model with PyTorch or onnxruntime (default: torch)")
+
+    args = parser.parse_args()
+    OCRService(args.model, args.host, args.port, args.threads, args.quantize, args.fast_decode,
+               args.backend).serve_forever()
+
+if __name__ == "__main__":
+    main()
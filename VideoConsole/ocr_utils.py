@@ -1,29 +1,160 @@
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
 from PIL import Image
 import cv2
+import os
 import threading
+import torch
+
+from ocr_service import OCRServiceClient
+
+# Greedy decoding with a token budget sized for short numeric fields like "12,345.67"
+FAST_DECODE_KWARGS = {"num_beams": 1, "do_sample": False, "max_new_tokens": 12}
+
+# "torch" runs the eager VisionEncoderDecoderModel, "onnx" the exported graphs under onnxruntime
+BACKENDS = ("torch", "onnx")
 
 class OCRProcessor:
-    def __init__(self, model_name="microsoft/trocr-base-printed"):
+    def __init__(self, model_name="microsoft/trocr-base-printed", cache=None, use_service=True,
+                 num_threads=None, quantize=False, fast_decode=False, backend="torch", onnx_dir=None,
+                 digit_recognizer=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown OCR backend: {backend}")
+        
         self.model_name = model_name
         self.model_loaded = False
         self.processor = None
         self.model = None
         
+        # Warm OCR service (ocr_service.py) used instead of loading weights when it's running
+        self.service = OCRServiceClient() if use_service else None
+        self.fallback_lock = threading.Lock()
+        
+        # CPU inference settings: intra-op threads and (torch backend) int8 dynamic quantization
+        self.num_threads = num_threads
+        self.quantize = quantize and backend == "torch"
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        
+        # Decode parameters (part of the cache key, since they change the output)
+        self.generate_kwargs = dict(FAST_DECODE_KWARGS) if fast_decode else {"max_new_tokens": 50}
+        
+        # Optional OCRCache shared across runs
+        self.cache = cache
+        
+        # Optional DigitRecognizer tried before the model and trained on its output
+        self.digit_recognizer = digit_recognizer
+        
         # Start loading in a separate thread
         self.load_thread = threading.Thread(target=self.load_model)
         self.load_thread.daemon = True
         self.load_thread.start()
     
     def load_model(self):
-        """Load the TrOCR model in a background thread"""
+        """Connect to the OCR service, or load the TrOCR model in a background thread"""
+        service = self.service
+        if service is not None:
+            if service.available(self.cache_namespace()):
+                self.model_loaded = True
+                print(f"Using OCR service at {service.url}")
+                return
+            self.service = None
+        
+        self.load_local_model()
+    
+    def load_local_model(self):
+        """Load the TrOCR model in-process; returns whether it loaded"""
         try:
+            if self.num_threads:
+                # Process-wide; more threads than physical cores only adds contention
+                torch.set_num_threads(self.num_threads)
+            
             self.processor = TrOCRProcessor.from_pretrained(self.model_name)
-            self.model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
+            if self.backend == "onnx":
+                self.model = self.load_onnx_model()
+            else:
+                model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
+                model.eval()
+                if self.quantize:
+                    # int8 weights for the Linear layers, which dominate encoder and decoder time on CPU
+                    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                self.model = model
             self.model_loaded = True
-            print("TrOCR model loaded successfully")
+            print(f"TrOCR model loaded successfully ({self.backend} backend)")
+            return True
         except Exception as e:
             print(f"Error loading TrOCR model: {str(e)}")
+            return False
+    
+    def load_onnx_model(self):
+        """Load the ONNX export of the model for onnxruntime, exporting it on first use"""
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForVision2Seq
+        except ImportError:
+            raise ImportError("The onnx backend needs optimum: pip install optimum[onnxruntime]")
+        from onnx_export import default_export_dir, export_onnx
+        
+        onnx_dir = self.onnx_dir or default_export_dir(self.model_name)
+        if not os.path.isfile(os.path.join(onnx_dir, "encoder_model.onnx")):
+            export_onnx(self.model_name, onnx_dir)
+        
+        session_options = onnxruntime.SessionOptions()
+        if self.num_threads:
+            session_options.intra_op_num_threads = self.num_threads
+        # generate() is unchanged; the decoder reuses its KV cache between tokens
+        return ORTModelForVision2Seq.from_pretrained(onnx_dir, use_cache=True, provider="CPUExecutionProvider",
+                                                     session_options=session_options)
+    
+    def fall_back_to_local_model(self, error):
+        """The OCR service went away: load the model in-process (once, even with several callers).
+        
+        The service stays set until the local model has loaded, so concurrent
+        callers keep failing over to here and wait on the lock instead of
+        running a model that isn't there yet.
+        """
+        with self.fallback_lock:
+            if self.service is None:
+                return
+            print(f"OCR service unavailable ({str(error)}), loading model in-process")
+            if not self.load_local_model():
+                raise error
+            self.service = None
+    
+    def to_pil_image(self, image):
+        """Convert an OpenCV (BGR) or PIL image to a PIL RGB image"""
+        # If image is a numpy array (OpenCV format), convert to PIL
+        if isinstance(image, cv2.UMat) or (hasattr(image, 'shape') and len(image.shape) == 3):
+            # Convert OpenCV BGR to RGB for PIL
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            return Image.fromarray(rgb_image)
+        elif isinstance(image, Image.Image):
+            return image
+        else:
+            raise ValueError("Unsupported image format")
+    
+    def cache_namespace(self):
+        """Identify the backend, model, weight precision and decode parameters for cache keys"""
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.generate_kwargs.items()))
+        model = f"{self.model_name}:int8" if self.quantize else self.model_name
+        engine = "trocr-onnx" if self.backend == "onnx" else "trocr"
+        return f"{engine}:{model}:{params}"
+    
+    def run_model(self, pil_images):
+        """Run TrOCR on a list of PIL images and return the stripped texts"""
+        service = self.service
+        if service is not None:
+            try:
+                return service.extract_text_batch(pil_images)
+            except Exception as e:
+                self.fall_back_to_local_model(e)
+        
+        # The processor resizes every crop to the encoder input size, so all
+        # regions from all frames stack into one pixel tensor
+        with torch.inference_mode():
+            pixel_values = self.processor(pil_images, return_tensors="pt").pixel_values
+            generated_ids = self.model.generate(pixel_values, **self.generate_kwargs)
+        extracted_texts = self.processor.batch_decode(generated_ids, skip_special_tokens=True)
+        return [text.strip() for text in extracted_texts]
     
     def extract_text(self, image):
         """Extract text from an image using TrOCR"""
@@ -31,26 +162,80 @@ class OCRProcessor:
             return None
             
         try:
-            # If image is a numpy array (OpenCV format), convert to PIL
-            if isinstance(image, cv2.UMat) or (hasattr(image, 'shape') and len(image.shape) == 3):
-                # Convert OpenCV BGR to RGB for PIL
-                rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(rgb_image)
-            elif isinstance(image, Image.Image):
-                pil_image = image
-            else:
-                raise ValueError("Unsupported image format")
-                
+            if self.digit_recognizer is not None:
+                fast_text = self.digit_recognizer.recognize(image)
+                if fast_text is not None:
+                    return fast_text
+            
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(image, self.cache_namespace())
+                cached_text = self.cache.get(cache_key)
+                if cached_text is not None:
+                    return cached_text
+            
             # Process the image with TrOCR
-            pixel_values = self.processor(pil_image, return_tensors="pt").pixel_values
-            generated_ids = self.model.generate(pixel_values, max_new_tokens=50)
-            extracted_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            extracted_text = self.run_model([self.to_pil_image(image)])[0]
             
-            return extracted_text.strip()
+            if cache_key is not None:
+                self.cache.put(cache_key, extracted_text)
+            if self.digit_recognizer is not None:
+                self.digit_recognizer.learn(image, extracted_text)
+            return extracted_text
         except Exception as e:
             print(f"Error extracting text: {str(e)}")
             return None
     
+    def extract_text_batch(self, images):
+        """Extract text from several images with a single TrOCR generate pass.
+        
+        `images` is either a list of images or a dict mapping keys such as
+        (frame_number, SelectionType) to images. The result has the same shape:
+        a list of texts in input order, or a dict with the same keys. Entries
+        are None when the model isn't loaded or extraction failed.
+        """
+        if isinstance(images, dict):
+            keys = list(images.keys())
+            texts = self.extract_text_batch([images[key] for key in keys])
+            return dict(zip(keys, texts))
+        
+        images = list(images)
+        if not images:
+            return []
+        if not self.model_loaded:
+            return [None] * len(images)
+            
+        try:
+            texts = [None] * len(images)
+            cache_keys = [None] * len(images)
+            
+            # Serve what we can from the digit recognizer and the cache, and
+            # only run the model on the rest
+            if self.digit_recognizer is not None:
+                texts = [self.digit_recognizer.recognize(image) for image in images]
+            
+            if self.cache is not None:
+                namespace = self.cache_namespace()
+                for i, image in enumerate(images):
+                    if texts[i] is None:
+                        cache_keys[i] = self.cache.make_key(image, namespace)
+                        texts[i] = self.cache.get(cache_keys[i])
+            
+            missing = [i for i, text in enumerate(texts) if text is None]
+            if missing:
+                extracted_texts = self.run_model([self.to_pil_image(images[i]) for i in missing])
+                for i, text in zip(missing, extracted_texts):
+                    texts[i] = text
+                    if cache_keys[i] is not None:
+                        self.cache.put(cache_keys[i], text)
+                    if self.digit_recognizer is not None:
+                        self.digit_recognizer.learn(images[i], text)
+            
+            return texts
+        except Exception as e:
+            print(f"Error extracting text batch: {str(e)}")
+            return [None] * len(images)
+    
     def clean_numeric_text(self, text):
         """Clean text to extract only numeric values (with decimal points)"""
         if not text:
@@ -0,0 +1,41 @@
+import argparse
+import os
+
+def default_export_dir(model_name):
+    """Where OCRProcessor looks for (and writes) the ONNX export of a model"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_models", model_name.replace("/", "--"))
+
+def export_onnx(model_name, output_dir=None):
+    """Export a TrOCR model to ONNX encoder and KV-cache decoder graphs.
+
+    Writes encoder_model.onnx, decoder_model.onnx and decoder_with_past_model.onnx
+    together with the processor files, so the directory loads with
+    ORTModelForVision2Seq.from_pretrained. Needs `pip install optimum[onnxruntime]`.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForVision2Seq
+    except ImportError:
+        raise ImportError("ONNX export needs optimum: pip install optimum[onnxruntime]")
+    from transformers import TrOCRProcessor
+
+    output_dir = output_dir or default_export_dir(model_name)
+    print(f"Exporting {model_name} to ONNX in {output_dir} (this takes a minute)")
+
+    model = ORTModelForVision2Seq.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(output_dir)
+    TrOCRProcessor.from_pretrained(model_name).save_pretrained(output_dir)
+
+    print(f"Exported {', '.join(sorted(f for f in os.listdir(output_dir) if f.endswith('.onnx')))}")
+    return output_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a TrOCR model to ONNX for OCRProcessor's onnx backend")
+    parser.add_argument("--model", default="microsoft/trocr-base-printed",
+                        help="Model name to export (default: microsoft/trocr-base-printed)")
+    parser.add_argument("--output", help="Output directory (default: VideoConsole/onnx_models/<model>)")
+
+    args = parser.parse_args()
+    export_onnx(args.model, args.output)
+
+if __name__ == "__main__":
+    main()
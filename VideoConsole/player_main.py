@@ -1,7 +1,14 @@
+import argparse
 import tkinter as tk
+from frame_source import DECODERS
 from video_player import VideoTextPlayer
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Video Text Player")
+    parser.add_argument("--decoder", choices=DECODERS, default="cv2",
+                        help="Video decoder: OpenCV or PyAV with threaded decoding and exact seeks (default: cv2)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = VideoTextPlayer(root)
+    app = VideoTextPlayer(root, decoder=args.decoder)
     root.mainloop()
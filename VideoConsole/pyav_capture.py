@@ -0,0 +1,194 @@
+import cv2
+import numpy as np
+
+class PyAVCapture:
+    """Drop-in replacement for the parts of cv2.VideoCapture this project uses, on PyAV.
+
+    Decoding uses FFmpeg's frame and slice threading (thread_type "AUTO").
+    Seeking via set(CAP_PROP_POS_FRAMES, n) seeks the container to the
+    keyframe before n by timestamp and decodes forward to exactly frame n, so
+    positions are frame-accurate. Frame numbers are derived from each frame's
+    PTS rather than counted.
+
+    With keyframes_only the decoder skips every non-keyframe (skip_frame
+    "NONKEY"); use iter_keyframes for very coarse sampling in that mode.
+    """
+
+    def __init__(self, video_path, keyframes_only=False):
+        try:
+            import av
+        except ImportError:
+            raise ImportError("The PyAV decoder needs PyAV: pip install av")
+
+        self.container = None
+        self.keyframes_only = keyframes_only
+        try:
+            self.container = av.open(video_path)
+            self.stream = self.container.streams.video[0]
+        except (av.error.FFmpegError, IndexError) as e:
+            print(f"PyAV could not open {video_path}: {str(e)}")
+            self.close_container()
+            return
+
+        self.stream.thread_type = "AUTO"
+        if keyframes_only:
+            self.stream.codec_context.skip_frame = "NONKEY"
+
+        self.time_base = self.stream.time_base
+        self.start_pts = self.stream.start_time or 0
+        self.fps = float(self.stream.average_rate or self.stream.guessed_rate or 30)
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        # Matroska/WebM store neither a frame count nor a stream duration
+        self.frame_count = self.stream.frames
+        if not self.frame_count and self.stream.duration:
+            self.frame_count = int(round(float(self.stream.duration * self.time_base) * self.fps))
+        if not self.frame_count and self.container.duration:
+            self.frame_count = int(round(self.container.duration / av.time_base * self.fps))
+        if not self.frame_count:
+            self.frame_count = self.count_packets(video_path)
+
+        self.frames = self.container.decode(self.stream)
+        self.lookahead = None  # frame decoded while seeking, returned by the next grab
+        self.current = None  # last grabbed av.VideoFrame
+        self.current_number = -1
+        self.position = 0  # frame number the next grab is expected to return
+
+    @staticmethod
+    def count_packets(video_path):
+        """Frame count from a demux pass over the video packets (nothing is decoded)"""
+        import av
+
+        with av.open(video_path) as container:
+            return sum(1 for packet in container.demux(container.streams.video[0]) if packet.size)
+
+    def close_container(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
+    def isOpened(self):
+        return self.container is not None
+
+    def frame_number(self, frame):
+        """Frame index from the frame's presentation timestamp"""
+        if frame.pts is None:
+            return self.position
+        return int(round(float((frame.pts - self.start_pts) * self.time_base) * self.fps))
+
+    def next_frame(self):
+        if self.lookahead is not None:
+            frame, self.lookahead = self.lookahead, None
+            return frame
+        try:
+            return next(self.frames)
+        except StopIteration:
+            return None
+
+    def grab(self):
+        if self.container is None:
+            return False
+        try:
+            frame = self.next_frame()
+        except Exception as e:
+            print(f"PyAV decode error: {str(e)}")
+            frame = None
+        if frame is None:
+            self.current = None
+            return False
+
+        self.current = frame
+        self.current_number = self.frame_number(frame)
+        self.position = self.current_number + 1
+        return True
+
+    def retrieve(self, image=None):
+        if self.current is None:
+            return False, None
+        frame = self.current.to_ndarray(format="bgr24")
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def seek(self, frame_number):
+        """Position so the next grab returns exactly `frame_number` (or the first frame after it)"""
+        target_pts = self.start_pts + int(frame_number / self.fps / self.time_base)
+        self.container.seek(target_pts, stream=self.stream, backward=True, any_frame=False)
+        self.frames = self.container.decode(self.stream)
+        self.lookahead = None
+        self.position = frame_number
+
+        # Decode (without converting) from the keyframe up to the target
+        while True:
+            try:
+                frame = next(self.frames)
+            except StopIteration:
+                return
+            except Exception as e:
+                # Leave the capture at end-of-stream, like grab() does on a decode error
+                print(f"PyAV decode error: {str(e)}")
+                self.frames = iter(())
+                return
+            if self.frame_number(frame) >= frame_number:
+                self.lookahead = frame
+                return
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES and self.container is not None:
+            self.seek(max(0, int(value)))
+            return True
+        return False
+
+    def get(self, prop):
+        if self.container is None:
+            return 0
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        return 0
+
+    def release(self):
+        self.close_container()
+
+    def iter_keyframes(self, start_frame, end_frame, min_gap=1):
+        """Yield (frame_number, frame) for keyframes in [start_frame, end_frame), at least min_gap apart"""
+        self.seek(start_frame)
+        last = None
+        while self.grab():
+            if self.current_number >= end_frame:
+                break
+            if self.keyframes_only or self.current.key_frame:
+                if last is None or self.current_number - last >= min_gap:
+                    last = self.current_number
+                    yield self.current_number, self.retrieve()[1]
+
+class KeyframeSampler:
+    """FrameSampler counterpart that only decodes keyframes (PyAV with keyframes_only)"""
+
+    def __init__(self, capture, start_frame, end_frame, step):
+        self.capture = capture
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.step = max(1, step)
+        self.sampled = 0
+
+    def __iter__(self):
+        for frame_number, frame in self.capture.iter_keyframes(self.start_frame, self.end_frame, self.step):
+            self.sampled += 1
+            yield frame_number, frame
+
+    def summary(self):
+        return f"{self.sampled} keyframes sampled (non-keyframes skipped by the decoder)"
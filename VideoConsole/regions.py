@@ -0,0 +1,42 @@
+import json
+from enum import Enum, auto
+
+class SelectionType(Enum):
+    CREDITS = auto()
+    WIN = auto()
+    BET = auto()
+
+def save_regions(path, regions):
+    """Save a {SelectionType: (x1, y1, x2, y2)} region definition to a JSON file"""
+    data = {sel_type.name: list(coords) for sel_type, coords in regions.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+def load_regions(path):
+    """Load a region definition saved with save_regions"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {SelectionType[name]: tuple(int(v) for v in coords) for name, coords in data.items()}
+
+def crop_regions(frame, regions):
+    """Crop each region out of a frame, clamped to the image bounds.
+    
+    Returns a dict keyed like `regions`; empty crops are left out.
+    """
+    crops = {}
+    frame_h, frame_w = frame.shape[:2]
+    
+    for sel_type, (x1, y1, x2, y2) in regions.items():
+        # Ensure coordinates are within image bounds
+        x1 = max(0, min(x1, frame_w))
+        y1 = max(0, min(y1, frame_h))
+        x2 = max(0, min(x2, frame_w))
+        y2 = max(0, min(y2, frame_h))
+        
+        cropped_frame = frame[y1:y2, x1:x2]
+        if cropped_frame.size == 0:
+            continue
+            
+        crops[sel_type] = cropped_frame
+    
+    return crops
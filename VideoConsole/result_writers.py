@@ -0,0 +1,167 @@
+import json
+import os
+
+OUTPUT_FORMATS = ("text", "jsonl", "parquet")
+
+# One row per recognized word (or region); the Parquet schema and JSONL word keys
+WORD_COLUMNS = ("frame", "timestamp", "region", "text", "conf", "x", "y", "w", "h")
+
+# Parquet also gets one row per frame that failed, with only frame, timestamp and error set
+PARQUET_COLUMNS = WORD_COLUMNS + ("error",)
+
+def format_for_path(path):
+    """Pick an output format from the file extension (text for anything unknown)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    return "text"
+
+def create_writer(output_format, path, header_lines=()):
+    """Open a result writer for extract_text_from_video results"""
+    if output_format == "jsonl":
+        return JsonLinesWriter(path)
+    if output_format == "parquet":
+        return ParquetWriter(path)
+    if output_format == "text":
+        return TextReportWriter(path, header_lines)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+def confidence_value(conf):
+    """Tesseract confidences come back as int, float or str; None when not reported"""
+    if conf is None or conf == "":
+        return None
+    return float(conf)
+
+class TextReportWriter:
+    """The human-readable report: a header, then a block per frame"""
+
+    def __init__(self, path, header_lines=()):
+        self.file = open(path, 'w', encoding='utf-8')
+        for line in header_lines:
+            self.file.write(line + "\n")
+        self.file.write("=" * 80 + "\n\n")
+
+    def write(self, result):
+        f = self.file
+        if result['error'] is not None:
+            f.write(f"  Error processing frame: {result['error']}\n\n")
+            return
+
+        # Write frame header to file
+        f.write(f"Frame {result['frame']} (Time: {result['timestamp']})\n")
+        f.write(f"Image saved as: {result['filename']}\n")
+
+        for word in result['words']:
+            # Write text and position data to file
+            confidence = f"{word['conf']}%" if word['conf'] is not None else "n/a"
+            label = word['region'].title() if 'region' in word else "Text"
+            f.write(f"  {label}: '{word['text']}' (Confidence: {confidence})\n")
+            f.write(f"  Position: x={word['x']}, y={word['y']}, width={word['w']}, height={word['h']}\n")
+
+        if not result['words']:
+            f.write("  No text detected in this frame.\n")
+
+        f.write("\n" + "-" * 40 + "\n\n")
+
+    def close(self):
+        self.file.close()
+
+class JsonLinesWriter:
+    """One JSON object per frame, streamed as results arrive"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, result):
+        record = {
+            "frame": result['frame'],
+            "timestamp": result['timestamp'].total_seconds(),
+            "filename": result['filename'],
+            "error": result['error'],
+            "words": [
+                {
+                    "region": word.get('region'),
+                    "text": word['text'],
+                    "conf": confidence_value(word['conf']),
+                    "x": word['x'], "y": word['y'], "w": word['w'], "h": word['h']
+                }
+                for word in result['words']
+            ]
+        }
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Columnar output with one row per word, written in row groups as it fills.
+
+    Rows are buffered per column and flushed as a row group every
+    `row_group_size` rows, so memory stays bounded on long runs and readers
+    can load just the columns they need. A frame that failed becomes a single
+    row with its `error` set and no word columns. Needs pyarrow.
+    """
+
+    def __init__(self, path, row_group_size=10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ("frame", pa.int64()),
+            ("timestamp", pa.float64()),
+            ("region", pa.string()),
+            ("text", pa.string()),
+            ("conf", pa.float64()),
+            ("x", pa.int32()),
+            ("y", pa.int32()),
+            ("w", pa.int32()),
+            ("h", pa.int32()),
+            ("error", pa.string())
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self.row_group_size = row_group_size
+        self.columns = {name: [] for name in PARQUET_COLUMNS}
+        self.rows = 0
+
+    def write(self, result):
+        timestamp = result['timestamp'].total_seconds()
+        if result['error'] is not None:
+            self.columns["frame"].append(result['frame'])
+            self.columns["timestamp"].append(timestamp)
+            for key in WORD_COLUMNS[2:]:
+                self.columns[key].append(None)
+            self.columns["error"].append(result['error'])
+            self.rows += 1
+
+        for word in result['words']:
+            self.columns["frame"].append(result['frame'])
+            self.columns["timestamp"].append(timestamp)
+            self.columns["region"].append(word.get('region'))
+            self.columns["text"].append(word['text'])
+            self.columns["conf"].append(confidence_value(word['conf']))
+            for key in ("x", "y", "w", "h"):
+                self.columns[key].append(word[key])
+            self.columns["error"].append(None)
+            self.rows += 1
+
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one row group"""
+        if self.rows == 0:
+            return
+        table = self.pa.Table.from_pydict(self.columns, schema=self.schema)
+        self.writer.write_table(table)
+        self.columns = {name: [] for name in PARQUET_COLUMNS}
+        self.rows = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
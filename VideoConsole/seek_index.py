@@ -0,0 +1,161 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from frame_source import FrameSampler
+
+class SeekIndex:
+    """Low-res thumbnails and keyframe positions for fast scrubbing.
+
+    Built on a background thread with its own capture and saved next to the
+    video as `<video>.seekindex.npz`, so later sessions load it instantly.
+    While the slider is dragged the player shows the nearest thumbnail and
+    only decodes the exact frame on release.
+
+    Keyframes are found by demuxing the container with PyAV (no decoding)
+    after the thumbnails are built, so thumbnails show up first. The frame
+    prefetcher uses them to seek to the keyframe before a target, and to
+    decode forward instead of seeking when no keyframe lies in between.
+    Without PyAV they stay unknown and seeks go straight to the target.
+    """
+
+    def __init__(self, video_path, thumbnail_width=128, max_thumbnails=2000):
+        self.video_path = video_path
+        self.index_path = f"{video_path}.seekindex.npz"
+        self.thumbnail_width = thumbnail_width
+        self.max_thumbnails = max_thumbnails
+
+        self.frame_numbers = np.empty(0, dtype=np.int64)
+        self.thumbnails = []
+        self.keyframes = None  # sorted keyframe frame numbers, None until scanned
+        self.lock = threading.Lock()
+        self.running = True
+        self.ready = False
+
+        self.thread = threading.Thread(target=self.load_or_build)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def video_signature(self):
+        """Size and modification time, used to detect a changed video file"""
+        stat = os.stat(self.video_path)
+        return np.array([stat.st_size, int(stat.st_mtime)], dtype=np.int64)
+
+    def load_or_build(self):
+        try:
+            if not self.load():
+                self.build()
+                if self.running:
+                    self.save()
+            self.ready = True
+
+            # Older index files have no keyframes; scan and save them once
+            if self.keyframes is None and self.running:
+                keyframes = self.find_keyframes()
+                if keyframes is not None and self.running:
+                    with self.lock:
+                        self.keyframes = keyframes
+                    self.save()
+        except Exception as e:
+            print(f"Error building seek index: {e}")
+
+    def load(self):
+        """Load a saved index if it matches the current video file"""
+        if not os.path.isfile(self.index_path):
+            return False
+
+        with np.load(self.index_path) as data:
+            if not np.array_equal(data["signature"], self.video_signature()):
+                return False
+            with self.lock:
+                self.frame_numbers = data["frame_numbers"]
+                self.thumbnails = list(data["thumbnails"])
+                if "keyframes" in data.files:
+                    self.keyframes = data["keyframes"]
+
+        print(f"Loaded seek index with {len(self.thumbnails)} thumbnails from {self.index_path}")
+        return True
+
+    def build(self):
+        """Decode a thumbnail at a fixed interval (growing the index as it goes)"""
+        video = cv2.VideoCapture(self.video_path)
+        if not video.isOpened():
+            return
+
+        total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = video.get(cv2.CAP_PROP_FPS) or 30
+        # At most max_thumbnails, and never more than one per second of video
+        interval = max(int(fps), total_frames // self.max_thumbnails + 1)
+
+        try:
+            for frame_number, frame in FrameSampler(video, 0, total_frames, interval):
+                if not self.running:
+                    return
+
+                frame_h, frame_w = frame.shape[:2]
+                thumb_h = max(1, int(frame_h * self.thumbnail_width / frame_w))
+                thumbnail = cv2.resize(frame, (self.thumbnail_width, thumb_h), interpolation=cv2.INTER_AREA)
+
+                with self.lock:
+                    self.frame_numbers = np.append(self.frame_numbers, frame_number)
+                    self.thumbnails.append(thumbnail)
+        finally:
+            video.release()
+
+    def find_keyframes(self):
+        """Keyframe frame numbers from the container, or None without PyAV or if stopped"""
+        try:
+            import av
+        except ImportError:
+            return None
+
+        keyframes = []
+        with av.open(self.video_path) as container:
+            stream = container.streams.video[0]
+            rate = stream.average_rate or stream.guessed_rate
+            # Only demux packets; nothing is decoded
+            for packet in container.demux(stream):
+                if not self.running:
+                    return None
+                if packet.is_keyframe and packet.pts is not None:
+                    seconds = float((packet.pts - (stream.start_time or 0)) * stream.time_base)
+                    keyframes.append(int(round(seconds * float(rate))))
+        return np.array(sorted(keyframes), dtype=np.int64)
+
+    def save(self):
+        with self.lock:
+            if not self.thumbnails:
+                return
+            arrays = {
+                "signature": self.video_signature(),
+                "frame_numbers": self.frame_numbers,
+                "thumbnails": np.stack(self.thumbnails)
+            }
+            if self.keyframes is not None:
+                arrays["keyframes"] = self.keyframes
+            np.savez(self.index_path, **arrays)
+        print(f"Saved seek index with {len(self.thumbnails)} thumbnails to {self.index_path}")
+
+    def nearest_thumbnail(self, frame_number):
+        """Return the thumbnail closest to a frame, or None if none is built yet"""
+        with self.lock:
+            if len(self.frame_numbers) == 0:
+                return None
+            i = int(np.searchsorted(self.frame_numbers, frame_number))
+            if i == len(self.frame_numbers) or (i > 0 and frame_number - self.frame_numbers[i - 1] < self.frame_numbers[i] - frame_number):
+                i -= 1
+            return self.thumbnails[i]
+
+    def keyframe_before(self, frame_number):
+        """Nearest keyframe at or before a frame, or None if keyframes are unknown"""
+        with self.lock:
+            keyframes = self.keyframes
+        if keyframes is None:
+            return None
+        i = int(np.searchsorted(keyframes, frame_number, side="right"))
+        return int(keyframes[i - 1]) if i > 0 else None
+
+    def close(self):
+        self.running = False
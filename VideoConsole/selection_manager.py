@@ -1,10 +1,7 @@
 import tkinter as tk
-from enum import Enum, auto
 
-class SelectionType(Enum):
-    CREDITS = auto()
-    WIN = auto()
-    BET = auto()
+# Region definitions live in a tk-free module so headless tools can import them
+from regions import SelectionType
 
 class SelectionManager:
     def __init__(self, canvas):
@@ -202,6 +199,15 @@ class SelectionManager:
         
         return (orig_x1, orig_y1, orig_x2, orig_y2)
     
+    def get_all_selection_coordinates(self):
+        """Get original image coordinates for every active selection"""
+        regions = {}
+        for sel_type in SelectionType:
+            coords = self.get_selection_coordinates(sel_type)
+            if coords is not None:
+                regions[sel_type] = coords
+        return regions
+    
     def get_active_selections(self):
         """Get a list of active selection types"""
         return [sel_type for sel_type, sel_data in self.selection_areas.items() if sel_data["active"]]
@@ -7,15 +7,20 @@ import numpy as np
 from datetime import timedelta
 import threading
 import time
-import queue
 
 from ocr_utils import OCRProcessor
+from ocr_cache import OCRCache
 from data_handler import DataHandler
 from graph_view import GraphView
-from selection_manager import SelectionManager, SelectionType
+from selection_manager import SelectionManager
+from regions import SelectionType, crop_regions, save_regions
+from change_detector import RegionChangeDetector
+from ocr_pipeline import OCRPipeline
+from frame_prefetcher import FramePrefetcher
+from seek_index import SeekIndex
 
 class VideoTextPlayer:
-    def __init__(self, root):
+    def __init__(self, root, decoder="cv2"):
         # Main window setup
         self.root = root
         self.root.title("Video Text Player")
@@ -23,12 +28,15 @@ class VideoTextPlayer:
         self.root.configure(bg="#f0f0f0")
         
         # Initialize components
-        self.ocr = OCRProcessor()
-        self.data_handler = DataHandler()
+        self.ocr = OCRProcessor(cache=OCRCache())
+        self.data_handler = DataHandler(background_writer=True)
         
         # Video variables
         self.video_path = None
-        self.cap = None
+        self.frame_source = None  # FramePrefetcher: decoder thread + ring buffer of frames
+        self.decoder = decoder  # "cv2" or "pyav" (see frame_source.open_video)
+        self.seek_index = None  # SeekIndex: thumbnails shown while dragging the slider
+        self.scrubbing = False
         self.fps = 0
         self.total_frames = 0
         self.current_frame = 0
@@ -38,8 +46,13 @@ class VideoTextPlayer:
         self.extracted_frames_dir = "extracted_frames"
         os.makedirs(self.extracted_frames_dir, exist_ok=True)
         
-        # Current frame image for processing
-        self.current_frame_image = None
+        # Display state: one PhotoImage and canvas item reused for every frame
+        # (fixed canvas dimensions - use the initial dimensions)
+        self.canvas_width = 1280
+        self.canvas_height = 720
+        self.photo = None
+        self.video_image_item = None
+        self.display_interpolation = cv2.INTER_AREA  # Good quality for downscaling; INTER_NEAREST is fastest
         
         # Current values display
         self.current_values = {
@@ -52,11 +65,13 @@ class VideoTextPlayer:
         self.auto_process = False
         self.process_interval = 15  # Process every 15 frames
         self.last_processed_frame = -self.process_interval  # Start immediately
-        self.processing_queue = queue.Queue()
+        self.ocr_queue_size = 8  # Frames waiting for OCR before the drop policy applies
+        self.ocr_drop_policy = "drop-oldest"  # "drop-oldest", "block" or "coalesce"
+        self.ocr_workers = 2  # OCR consumer threads
+        self.ocr_batch_size = 4  # Queued frames each consumer OCRs in one model call
         
-        # Thread synchronization
-        self.video_lock = threading.RLock()  # Reentrant lock for video access
-        self.frame_buffer = None  # Store the latest frame for processing
+        # Reuse the previous text for regions that haven't changed since they were OCR'd
+        self.change_detector = RegionChangeDetector(threshold=2.0)
         
         # Create UI components
         self.create_widgets()
@@ -65,10 +80,31 @@ class VideoTextPlayer:
         self.playback_thread = None
         self.stop_playback = False
         
-        # Start background processing thread
-        self.processing_thread = threading.Thread(target=self.process_queue)
-        self.processing_thread.daemon = True
-        self.processing_thread.start()
+        # Display coalescing: at most one pending display callback, showing the newest frame
+        self.display_lock = threading.Lock()
+        self.pending_display_image = None
+        self.display_scheduled = False
+        
+        # Playback rate statistics
+        self.frames_skipped = 0
+        self.frames_displayed = 0
+        self.fps_window_start = time.perf_counter()
+        self.achieved_fps = 0.0
+        
+        # Start background processing: work items carry their own frame number and crops
+        self.ocr_pipeline = OCRPipeline(
+            self.process_frames_in_background,
+            on_result=lambda frame_number, results: self.root.after(
+                0, lambda: self.save_background_results(frame_number, results)),
+            maxsize=self.ocr_queue_size,
+            policy=self.ocr_drop_policy,
+            workers=self.ocr_workers,
+            batch_size=self.ocr_batch_size
+        )
+        self.update_pipeline_status()
+        
+        # Flush buffered CSV rows before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def create_widgets(self):
         # Main frame layout
@@ -193,6 +229,11 @@ class VideoTextPlayer:
                                           command=self.update_graph, state=tk.DISABLED)
         self.update_graph_btn.pack(side=tk.LEFT, padx=5)
         
+        # Save regions button (for headless batch extraction)
+        self.save_regions_btn = ttk.Button(control_frame, text="Save Regions", 
+                                          command=self.save_regions, state=tk.DISABLED)
+        self.save_regions_btn.pack(side=tk.LEFT, padx=5)
+        
         # Clear all selections button
         self.clear_all_btn = ttk.Button(control_frame, text="Clear All Selections", 
                                        command=self.clear_all_selections, state=tk.DISABLED)
@@ -213,10 +254,21 @@ class VideoTextPlayer:
         self.progress_bar.pack(fill=tk.X, padx=10)
         self.progress_bar.config(state=tk.DISABLED)
         
+        # While dragging show seek index thumbnails; decode the exact frame on release
+        self.progress_bar.bind("<ButtonPress-1>", self.start_scrub)
+        self.progress_bar.bind("<ButtonRelease-1>", self.end_scrub)
+        
         # Status bar
-        self.status_bar = tk.Label(main_frame, text="Ready. Load a video to begin.", 
+        status_frame = tk.Frame(main_frame, bg="#f0f0f0")
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # OCR pipeline status (queue depth, latency, drops)
+        self.pipeline_status = tk.Label(status_frame, text="", bd=1, relief=tk.SUNKEN, anchor=tk.E)
+        self.pipeline_status.pack(side=tk.RIGHT)
+        
+        self.status_bar = tk.Label(status_frame, text="Ready. Load a video to begin.", 
                                   bd=1, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
     
     def load_video(self):
         # Open file dialog to select video
@@ -227,29 +279,39 @@ class VideoTextPlayer:
         
         if file_path:
             # Release previous video if any
-            if self.cap is not None:
+            if self.frame_source is not None:
                 self.stop_playback = True
                 if self.playback_thread and self.playback_thread.is_alive():
                     self.playback_thread.join()
-                self.cap.release()
+                self.frame_source.close()
+                self.frame_source = None
+            if self.seek_index is not None:
+                self.seek_index.close()
             
             self.video_path = file_path
-            self.cap = cv2.VideoCapture(file_path)
-            
-            if not self.cap.isOpened():
+            try:
+                self.frame_source = FramePrefetcher(file_path, decoder=self.decoder)
+            except IOError:
                 self.status_bar.config(text=f"Error: Could not open video {file_path}")
                 return
+            except ImportError as e:
+                self.status_bar.config(text=f"Error: {str(e)}")
+                return
             
             # Get video properties
-            self.fps = self.cap.get(cv2.CAP_PROP_FPS)
-            self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.fps = self.frame_source.fps
+            self.total_frames = self.frame_source.total_frames
             self.duration = self.total_frames / self.fps
             self.current_frame = 0
             
+            # Load (or build in the background) the thumbnail index for scrubbing; its
+            # keyframes let the prefetcher pick where to seek on release
+            self.seek_index = SeekIndex(file_path)
+            self.frame_source.keyframe_index = self.seek_index
+            
             # Display the first frame
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.cap.read()
-            if ret:
+            frame = self.read_frame(0)
+            if frame is not None:
                 self.display_frame(frame)
             
             # Update time label and controls
@@ -261,58 +323,97 @@ class VideoTextPlayer:
             self.clear_all_btn.config(state=tk.NORMAL)
             self.auto_process_btn.config(state=tk.NORMAL)
             self.update_graph_btn.config(state=tk.NORMAL)
+            self.save_regions_btn.config(state=tk.NORMAL)
             self.update_selection_type()
             
             # Update status
             video_name = os.path.basename(file_path)
             self.status_bar.config(text=f"Loaded: {video_name} | {self.fps:.2f} FPS | Duration: {timedelta(seconds=self.duration)}")
     
-    def display_frame(self, frame):
-        # Convert frame from BGR to RGB for display
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Get fixed canvas dimensions - use the initial dimensions
-        canvas_width = 1280
-        canvas_height = 720
+    def on_close(self):
+        """Stop background work and flush data before exiting"""
+        self.playing = False
+        self.stop_playback = True
+        if self.playback_thread and self.playback_thread.is_alive():
+            self.playback_thread.join(timeout=1.0)
+        
+        self.ocr_pipeline.stop()
+        self.data_handler.close()
+        if self.ocr.cache is not None:
+            # After the consumers finish their current batch, so no OCR call uses the closed cache;
+            # closing writes the batched last-used updates and checkpoints the WAL
+            for worker in self.ocr_pipeline.workers:
+                worker.join(timeout=5.0)
+            self.ocr.cache.close()
+        if self.frame_source is not None:
+            self.frame_source.close()
+        if self.seek_index is not None:
+            self.seek_index.close()
+        self.root.destroy()
+    
+    def read_frame(self, frame_number):
+        """Get a frame from the prefetcher, or None at the end of the video or if the decoder is stalled"""
+        try:
+            return self.frame_source.get_frame(frame_number)
+        except TimeoutError as e:
+            print(f"Warning: {str(e)}")
+            return None
+    
+    def display_size(self, frame_w, frame_h):
+        """Size that fits a frame in the canvas while maintaining aspect ratio"""
+        ratio = min(self.canvas_width / frame_w, self.canvas_height / frame_h)
+        return int(frame_w * ratio), int(frame_h * ratio)
+    
+    def scale_for_display(self, frame):
+        """Fit a frame to the canvas; returns the RGB display image and the frame/display scale factors.
         
+        The result is a new, small image, so the frame (usually a ring buffer slot) isn't needed afterwards.
+        """
         # Resize frame to fit canvas while maintaining aspect ratio
         frame_h, frame_w = frame.shape[:2]
-        ratio = min(canvas_width / frame_w, canvas_height / frame_h)
-        new_w = int(frame_w * ratio)
-        new_h = int(frame_h * ratio)
+        new_w, new_h = self.display_size(frame_w, frame_h)
         
+        # Resize first, then convert only the small image from BGR to RGB
+        resized_frame = cv2.resize(frame, (new_w, new_h), interpolation=self.display_interpolation)
+        return cv2.cvtColor(resized_frame, cv2.COLOR_BGR2RGB), (frame_w / new_w, frame_h / new_h)
+    
+    def display_frame(self, frame):
+        """Show a full-resolution frame"""
+        self.show_display_image(*self.scale_for_display(frame))
+    
+    def show_display_image(self, rgb_image, scale_factors):
+        """Show an image from scale_for_display"""
         # Store scale factors for coordinate conversion
-        scale_factor_x = frame_w / new_w
-        scale_factor_y = frame_h / new_h
-        self.selection_manager.set_scale_factors(scale_factor_x, scale_factor_y)
-        
-        resized_frame = cv2.resize(rgb_frame, (new_w, new_h))
-        
-        # Store the current frame for OCR processing
-        self.current_frame_image = frame.copy()
-        
-        # Convert to PhotoImage
-        self.photo = ImageTk.PhotoImage(image=Image.fromarray(resized_frame))
-        
-        # Clear canvas and display the image
-        self.video_canvas.delete("all")
-        self.video_canvas.create_image(canvas_width // 2, canvas_height // 2, image=self.photo)
-        
-        # Redraw all active selection rectangles
-        self.selection_manager.redraw_all_selections()
+        self.selection_manager.set_scale_factors(*scale_factors)
+        self.show_image(rgb_image)
+    
+    def display_thumbnail(self, thumbnail):
+        """Show a seek index thumbnail scaled up to the video's display size"""
+        new_w, new_h = self.display_size(self.frame_source.width, self.frame_source.height)
+        resized = cv2.resize(thumbnail, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        self.show_image(cv2.cvtColor(resized, cv2.COLOR_BGR2RGB))
+    
+    def show_image(self, rgb_image):
+        """Put an RGB image on the canvas, reusing the PhotoImage when the size matches"""
+        new_h, new_w = rgb_image.shape[:2]
         
-        # Check if we should auto-process this frame
-        if self.auto_process and self.playing:
-            current_pos = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            if current_pos >= self.last_processed_frame + self.process_interval:
-                self.last_processed_frame = current_pos
-                # Store the current frame for processing
-                self.frame_buffer = frame.copy()
-                # Add to processing queue instead of processing immediately
-                self.processing_queue.put(current_pos)
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == (new_w, new_h):
+            # Update the existing PhotoImage in place; the canvas item and selections stay put
+            self.photo.paste(Image.fromarray(rgb_image))
+        else:
+            # First frame or new size: create the PhotoImage and its canvas item
+            self.photo = ImageTk.PhotoImage(image=Image.fromarray(rgb_image))
+            if self.video_image_item is None:
+                self.video_image_item = self.video_canvas.create_image(
+                    self.canvas_width // 2, self.canvas_height // 2, image=self.photo)
+            else:
+                self.video_canvas.itemconfig(self.video_image_item, image=self.photo)
+            
+            # Keep the video underneath the selection rectangles
+            self.video_canvas.tag_lower(self.video_image_item)
     
     def toggle_play_pause(self):
-        if not self.cap:
+        if not self.frame_source:
             return
         
         if self.playing:
@@ -332,37 +433,114 @@ class VideoTextPlayer:
             self.playback_thread.start()
     
     def play_video(self):
+        """Playback loop driven by the wall clock rather than fixed sleeps.
+        
+        The frame that should be on screen is computed from the elapsed time,
+        so decode and display time don't slow playback down. When behind, late
+        frames are skipped (except those due for OCR), and only the newest
+        frame is ever waiting for display. Frames come from the prefetcher's
+        ring buffer, which the decoder thread fills ahead of the play head.
+        """
+        speed = self.playback_speed
+        clock_start = time.perf_counter()
+        clock_start_frame = self.current_frame
+        last_shown = self.current_frame
+        
         # Main playback loop
         while self.playing and not self.stop_playback:
-            # Get the next frame with lock to prevent concurrent access
-            with self.video_lock:
-                ret, frame = self.cap.read()
-                
-                if not ret:
-                    # End of video
-                    self.playing = False
-                    self.play_pause_btn.config(text="Play")
-                    # Reset to beginning
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    self.current_frame = 0
-                    # Update UI
-                    self.root.after(0, self.update_time_label)
-                    break
-                
-                # Update current frame
-                self.current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            # Restart the clock from here if the speed was changed or the user seeked
+            if speed != self.playback_speed or self.current_frame != last_shown:
+                speed = self.playback_speed
+                clock_start = time.perf_counter()
+                clock_start_frame = self.current_frame
+            
+            frames_per_second = self.fps * speed
+            due_frame = clock_start_frame + int((time.perf_counter() - clock_start) * frames_per_second)
+            target_frame = max(self.current_frame + 1, due_frame)
+            
+            # Frames skipped over are still OCR'd if the sampler would have picked them
+            if self.auto_process:
+                sample_frame = max(self.last_processed_frame + self.process_interval, self.current_frame + 1)
+                while sample_frame < target_frame:
+                    sample = self.read_frame(sample_frame)
+                    if sample is None:
+                        break
+                    self.last_processed_frame = sample_frame
+                    self.queue_frame_for_processing(sample_frame, sample)
+                    sample_frame += self.process_interval
             
-            # Display the frame
-            self.root.after(0, lambda f=frame.copy(): self.display_frame(f))
+            try:
+                frame = self.frame_source.get_frame(target_frame)
+            except TimeoutError:
+                # The decoder is stalled (e.g. a slow seek), not at the end: keep waiting for this
+                # frame, and restart the clock from it so playback doesn't jump ahead afterwards
+                clock_start = time.perf_counter()
+                clock_start_frame = target_frame
+                continue
             
-            # Update progress and time
-            self.root.after(0, self.update_time_label)
+            if frame is None:
+                # End of video
+                self.playing = False
+                self.play_pause_btn.config(text="Play")
+                # Reset to beginning
+                self.current_frame = 0
+                # Update UI
+                self.root.after(0, self.update_time_label)
+                break
+            
+            self.frames_skipped += target_frame - self.current_frame - 1
+            self.current_frame = target_frame
+            last_shown = target_frame
+            
+            # Queue this frame's crops for OCR if it's due
+            if self.auto_process and self.current_frame >= self.last_processed_frame + self.process_interval:
+                self.last_processed_frame = self.current_frame
+                self.queue_frame_for_processing(self.current_frame, frame)
+            
+            # Scale the frame now, before sleeping, and on this thread rather than the Tk thread: the
+            # small result is our own, so the ring buffer slot can be reused without a full-resolution copy
+            display_image = self.scale_for_display(frame)
+            
+            # Wait until this frame is due
+            frame_time = clock_start + (target_frame - clock_start_frame) / frames_per_second
+            delay = frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            
+            # Display the frame: replace any frame still waiting instead of queueing another callback
+            with self.display_lock:
+                self.pending_display_image = display_image
+                if not self.display_scheduled:
+                    self.display_scheduled = True
+                    self.root.after(0, self.show_pending_frame)
+    
+    def show_pending_frame(self):
+        """Display the newest frame from the playback thread (runs on the Tk main thread)"""
+        with self.display_lock:
+            display_image = self.pending_display_image
+            self.pending_display_image = None
+            self.display_scheduled = False
+        
+        # Don't fight the slider while it's being dragged
+        if display_image is None or self.scrubbing:
+            return
             
-            # Control playback speed - adjust sleep time based on playback speed
-            time.sleep(1 / (self.fps * self.playback_speed))
+        self.show_display_image(*display_image)
+        
+        # Measure achieved display rate over roughly one second windows
+        self.frames_displayed += 1
+        now = time.perf_counter()
+        elapsed = now - self.fps_window_start
+        if elapsed >= 1.0:
+            self.achieved_fps = self.frames_displayed / elapsed
+            self.frames_displayed = 0
+            self.fps_window_start = now
+        
+        # Update progress and time
+        self.update_time_label()
     
     def update_time_label(self):
-        if not self.cap:
+        if not self.frame_source:
             return
         
         # Calculate current time and total duration
@@ -373,43 +551,58 @@ class VideoTextPlayer:
         current_str = str(timedelta(seconds=int(current_time)))
         total_str = str(timedelta(seconds=int(total_time)))
         
-        # Update label
-        self.time_label.config(text=f"{current_str} / {total_str}")
+        # Update label (with achieved vs target display rate while playing)
+        label = f"{current_str} / {total_str}"
+        if self.playing:
+            label += f" | {self.achieved_fps:.1f}/{self.fps * self.playback_speed:.1f} fps"
+        self.time_label.config(text=label)
         
         # Update progress bar without triggering the seek function
         progress_val = (self.current_frame / self.total_frames) * 100
         self.progress_var.set(progress_val)
     
     def seek(self, value):
-        if not self.cap or self.progress_bar.cget('state') == tk.DISABLED:
+        if not self.frame_source or self.progress_bar.cget('state') == tk.DISABLED:
             return
         
         # Calculate the frame to seek to
         value = float(value)
-        target_frame = int((value / 100) * self.total_frames)
+        target_frame = min(int((value / 100) * self.total_frames), self.total_frames - 1)
+        
+        # While dragging, show the nearest thumbnail instead of decoding
+        if self.scrubbing and self.seek_index is not None:
+            thumbnail = self.seek_index.nearest_thumbnail(target_frame)
+            if thumbnail is not None:
+                self.display_thumbnail(thumbnail)
+                current_str = str(timedelta(seconds=int(target_frame / self.fps)))
+                total_str = str(timedelta(seconds=int(self.total_frames / self.fps)))
+                self.time_label.config(text=f"{current_str} / {total_str}")
+                return
         
-        # Use lock when accessing the video file
-        with self.video_lock:
-            # Seek to the frame
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-            
-            # Update current frame
-            self.current_frame = target_frame
-            
-            # Display the frame
-            ret, frame = self.cap.read()
-            if ret:
-                frame_copy = frame.copy()  # Make a copy to avoid threading issues
-                # Step back to keep position correct
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+        # Served from the ring buffer for short scrubs; the decoder seeks otherwise
+        frame = self.read_frame(target_frame)
+        
+        # Update current frame
+        self.current_frame = target_frame
         
-        # Display the frame (outside the lock)
-        if ret:
-            self.display_frame(frame_copy)
+        # Display the frame
+        if frame is not None:
+            self.display_frame(frame)
         
         # Update time label
         self.update_time_label()
     
+    def start_scrub(self, event):
+        """Slider pressed: show thumbnails until it's released"""
+        self.scrubbing = True
+    
+    def end_scrub(self, event):
+        """Slider released: decode and show the exact frame"""
+        if not self.scrubbing:
+            return
+        self.scrubbing = False
+        self.seek(self.progress_var.get())
+    
     def update_selection_type(self):
         """Update the current selection type based on radio button selection"""
         selection_str = self.selection_var.get()
@@ -421,6 +614,23 @@ class VideoTextPlayer:
         if status_msg:
             self.status_bar.config(text=status_msg)
     
+    def save_regions(self):
+        """Save the active selections as a region definition for batch_extractor.py"""
+        regions = self.selection_manager.get_all_selection_coordinates()
+        if not regions:
+            self.status_bar.config(text="Please create at least one selection rectangle first")
+            return
+            
+        file_path = filedialog.asksaveasfilename(
+            title="Save Regions",
+            defaultextension=".json",
+            filetypes=[("Region files", "*.json"), ("All files", "*.*")]
+        )
+        
+        if file_path:
+            save_regions(file_path, regions)
+            self.status_bar.config(text=f"Saved {len(regions)} regions to {file_path}")
+    
     def clear_all_selections(self):
         """Clear all selection rectangles"""
         self.selection_manager.clear_all_selections()
@@ -436,25 +646,23 @@ class VideoTextPlayer:
     
     def extract_current_frame(self):
         """Extract text from the current frame"""
-        if not self.cap:
+        if not self.frame_source:
             return
             
         if not self.ocr.model_loaded:
             self.status_bar.config(text="Please wait for the TrOCR model to finish loading...")
             return
         
-        # Get the current frame with lock
-        with self.video_lock:
-            current_pos = self.cap.get(cv2.CAP_PROP_POS_FRAMES)
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, current_pos - 1)  # Adjust for already moved position
-            ret, frame = self.cap.read()
+        # Get the current frame from the ring buffer (no seek needed)
+        current_pos = self.current_frame
+        frame = self.read_frame(current_pos)
+        
+        if frame is None:
+            self.status_bar.config(text="Error: Could not read current frame")
+            return
             
-            if not ret:
-                self.status_bar.config(text="Error: Could not read current frame")
-                return
-                
-            # Make a copy of the frame to avoid threading issues
-            frame = frame.copy()
+        # Make a copy, since the frame is annotated below and ring buffer slots get reused
+        frame = frame.copy()
         
         # Save the frame
         frame_filename = os.path.join(self.extracted_frames_dir, f"frame_{int(current_pos):06d}.jpg")
@@ -496,13 +704,10 @@ class VideoTextPlayer:
             self.status_bar.config(text=f"Error extracting text: {str(e)}")
             self.text_display.delete(1.0, tk.END)
             self.text_display.insert(tk.END, f"Error extracting text: {str(e)}")
-        
-        # Reset position to maintain continuity
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, current_pos)
     
     def extract_all_selections(self):
         """Extract text from all selection areas and save to CSV"""
-        if not self.cap or self.current_frame_image is None:
+        if not self.frame_source:
             self.status_bar.config(text="No video loaded or no frame available")
             return
             
@@ -513,57 +718,44 @@ class VideoTextPlayer:
             return
             
         # Get the current frame position and timestamp
-        current_pos = self.cap.get(cv2.CAP_PROP_POS_FRAMES)
+        current_pos = self.current_frame
         timestamp = timedelta(seconds=current_pos/self.fps)
         
+        # Get the current frame from the ring buffer (no seek needed)
+        frame = self.read_frame(current_pos)
+        if frame is None:
+            self.status_bar.config(text="Error: Could not read current frame")
+            return
+        
+        # Copy just the crops, since ring buffer slots get reused
+        crops = {sel_type: crop.copy() for sel_type, crop in self.get_selection_crops(frame).items()}
+        
         # Clear previous text
         self.text_display.delete(1.0, tk.END)
         self.text_display.insert(tk.END, f"Frame {int(current_pos)} (Time: {timestamp})\n\n")
         
-        # Extract text from each active selection
-        results = {}
-        
-        for sel_type in SelectionType:
-            coords = self.selection_manager.get_selection_coordinates(sel_type)
-            if coords is None:
-                continue
-                
-            orig_x1, orig_y1, orig_x2, orig_y2 = coords
-            
-            # Ensure coordinates are within image bounds
-            frame_h, frame_w = self.current_frame_image.shape[:2]
-            orig_x1 = max(0, min(orig_x1, frame_w))
-            orig_y1 = max(0, min(orig_y1, frame_h))
-            orig_x2 = max(0, min(orig_x2, frame_w))
-            orig_y2 = max(0, min(orig_y2, frame_h))
-            
-            # Crop the image
-            cropped_frame = self.current_frame_image[orig_y1:orig_y2, orig_x1:orig_x2]
-            
-            if cropped_frame.size == 0:
-                continue
-                
-            # Save the cropped frame
+        # Save the crops
+        for sel_type, cropped_frame in crops.items():
             frame_filename = os.path.join(
                 self.extracted_frames_dir, 
                 f"frame_{int(current_pos):06d}_{self.selection_manager.selection_areas[sel_type]['label'].lower()}.jpg"
             )
             cv2.imwrite(frame_filename, cropped_frame)
-            
-            # Process with OCR
-            try:
-                raw_text = self.ocr.extract_text(cropped_frame)
-                if raw_text:
-                    # Clean the text to extract only numeric values
-                    cleaned_text = self.ocr.clean_numeric_text(raw_text)
-                    
-                    if cleaned_text:
-                        results[sel_type] = cleaned_text
-                        self.text_display.insert(tk.END, f"{self.selection_manager.selection_areas[sel_type]['label']}: {raw_text} → {cleaned_text}\n\n")
-                    else:
-                        self.text_display.insert(tk.END, f"{self.selection_manager.selection_areas[sel_type]['label']}: {raw_text} (not a valid number)\n\n")
-            except Exception as e:
-                print(f"Error extracting text: {str(e)}")
+        
+        # Process all selections with a single OCR pass
+        results = {}
+        raw_texts = self.ocr.extract_text_batch(crops)
+        
+        for sel_type, raw_text in raw_texts.items():
+            if raw_text:
+                # Clean the text to extract only numeric values
+                cleaned_text = self.ocr.clean_numeric_text(raw_text)
+                
+                if cleaned_text:
+                    results[sel_type] = cleaned_text
+                    self.text_display.insert(tk.END, f"{self.selection_manager.selection_areas[sel_type]['label']}: {raw_text} → {cleaned_text}\n\n")
+                else:
+                    self.text_display.insert(tk.END, f"{self.selection_manager.selection_areas[sel_type]['label']}: {raw_text} (not a valid number)\n\n")
         
         # Update current values display
         self.update_current_values(results)
@@ -573,9 +765,10 @@ class VideoTextPlayer:
             self.status_bar.config(text=f"Text extracted from all selections and saved to CSV")
         else:
             self.status_bar.config(text=f"Text extracted but not saved to CSV (validation failed)")
-        
-        # Reset position to maintain continuity
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, current_pos)
+    
+    def get_selection_crops(self, frame):
+        """Crop every active selection out of a frame, keyed by SelectionType"""
+        return crop_regions(frame, self.selection_manager.get_all_selection_coordinates())
     
     def update_current_values(self, results):
         """Update the current values display"""
@@ -597,7 +790,7 @@ class VideoTextPlayer:
     
     def toggle_auto_process(self):
         """Toggle automatic processing of frames"""
-        if not self.cap:
+        if not self.frame_source:
             return
             
         # Check if any selections are active
@@ -616,9 +809,9 @@ class VideoTextPlayer:
             self.status_bar.config(text="Auto processing disabled")
     
     def update_graph(self):
-        """Update the graph with data from the CSV file"""
-        data_df = self.data_handler.get_data_for_graph()
-        status_msg = self.graph_view.update_graph(data_df)
+        """Update the graph with the data saved so far"""
+        data = self.data_handler.get_data_for_graph()
+        status_msg = self.graph_view.update_graph(data)
         self.status_bar.config(text=status_msg)
     
     def update_playback_speed(self, event=None):
@@ -628,83 +821,57 @@ class VideoTextPlayer:
         self.playback_speed = float(speed_str.replace('x', ''))
         self.status_bar.config(text=f"Playback speed set to {speed_str}")
     
-    def process_queue(self):
-        """Background thread to process frames from the queue"""
-        while True:
-            try:
-                # Get frame number from queue with a timeout
-                frame_number = self.processing_queue.get(timeout=0.5)
-                
-                # Process the frame
-                self.process_frame_in_background(frame_number)
-                
-                # Mark task as done
-                self.processing_queue.task_done()
-                
-            except queue.Empty:
-                # No frames to process, just continue waiting
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"Error in processing thread: {str(e)}")
-                time.sleep(1)  # Avoid tight loop in case of persistent errors
-    
-    def process_frame_in_background(self, frame_number):
-        """Process a frame in the background thread using TrOCR"""
-        if not self.cap or self.frame_buffer is None:
-            return
-            
+    def queue_frame_for_processing(self, frame_number, frame):
+        """Crop the active selections and hand them to the OCR pipeline"""
+        regions = self.selection_manager.get_all_selection_coordinates()
+        # Copy the crops so the item doesn't depend on the decoded frame buffer
+        crops = {sel_type: crop.copy() for sel_type, crop in crop_regions(frame, regions).items()}
+        if crops:
+            self.ocr_pipeline.submit(frame_number, crops, regions)
+    
+    def update_pipeline_status(self):
+        """Refresh the OCR pipeline counters in the status bar"""
+        self.pipeline_status.config(text=self.ocr_pipeline.status_text())
+        self.root.after(500, self.update_pipeline_status)
+    
+    def process_frames_in_background(self, items):
+        """Run TrOCR on a batch of queued (frame_number, crops, regions) items (called on an OCR pipeline thread)"""
         if not self.ocr.model_loaded:
             print("TrOCR model not loaded yet, skipping frame processing")
-            return
-            
-        # Use the buffered frame instead of accessing the video file
-        frame = self.frame_buffer.copy()
-            
-        # Get timestamp
-        timestamp = timedelta(seconds=frame_number/self.fps)
-        
-        # Extract text from each active selection
-        results = {}
-        
-        for sel_type in SelectionType:
-            coords = self.selection_manager.get_selection_coordinates(sel_type)
-            if coords is None:
-                continue
-                
-            orig_x1, orig_y1, orig_x2, orig_y2 = coords
-            
-            # Ensure coordinates are within image bounds
-            frame_h, frame_w = frame.shape[:2]
-            orig_x1 = max(0, min(orig_x1, frame_w))
-            orig_y1 = max(0, min(orig_y1, frame_h))
-            orig_x2 = max(0, min(orig_x2, frame_w))
-            orig_y2 = max(0, min(orig_y2, frame_h))
-            
-            # Crop the image
-            cropped_frame = frame[orig_y1:orig_y2, orig_x1:orig_x2]
-            
-            if cropped_frame.size == 0:
-                continue
-                
-            try:
-                # Extract text
-                raw_text = self.ocr.extract_text(cropped_frame)
-                
+            return [None] * len(items)
+            
+        # Every active selection of every frame in one batch, keyed like BatchExtractor.flush
+        batch = {}
+        item_regions = {}
+        for frame_number, crops, regions in items:
+            item_regions[frame_number] = regions
+            for sel_type, crop in crops.items():
+                batch[(frame_number, sel_type)] = crop
+        
+        # Only OCR regions that changed; a moved or resized selection counts as a new region
+        raw_texts = self.change_detector.extract_text_batch(
+            self.ocr, batch, region_of=lambda key: (key[1], item_regions[key[0]][key[1]]))
+        
+        all_results = []
+        for frame_number, crops, regions in items:
+            results = {}
+            for sel_type in crops:
                 # Clean the text to extract only numeric values
+                raw_text = raw_texts.get((frame_number, sel_type))
                 if raw_text:
                     cleaned_text = self.ocr.clean_numeric_text(raw_text)
                     if cleaned_text:
                         results[sel_type] = cleaned_text
-            except Exception as e:
-                print(f"Error extracting text from {sel_type.name}: {str(e)}")
-        
-        # Save results to CSV if we found any text
-        if results:
-            # Update UI and save to CSV in the main thread
-            self.root.after(0, lambda: self.save_background_results(frame_number, timestamp, results))
+            
+            # Save results to CSV if we found any text (the pipeline hands them back in frame order)
+            all_results.append(results or None)
+        return all_results
     
-    def save_background_results(self, frame_number, timestamp, results):
+    def save_background_results(self, frame_number, results):
         """Save results from background processing"""
+        # Get timestamp
+        timestamp = timedelta(seconds=frame_number/self.fps)
+        
         # Update current values display
         self.update_current_values(results)
         
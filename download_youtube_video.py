@@ -5,6 +5,7 @@ import datetime
 import re
 import platform
 import argparse
+import json
 
 def list_formats(video_url, cookies_file=None):
     """List all available formats for the video"""
@@ -41,7 +42,90 @@ def list_formats(video_url, cookies_file=None):
         print(f"An error occurred: {str(e)}")
         return False
 
-def download_with_ytdlp(video_url, format_code=None, cookies_file=None):
+def fetch_video_info(video_url, cookies_file=None):
+    """Return yt-dlp's metadata for the video, including the formats shown by --list, or None"""
+    command = ["yt-dlp", "-J", "--no-playlist"]
+    if cookies_file:
+        command.extend(["--cookies", cookies_file])
+    command.append(video_url)
+
+    result = subprocess.run(command,
+                           shell=(platform.system() == "Windows"),
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.PIPE,
+                           text=True)
+    if result.returncode != 0:
+        print(f"Error fetching formats: {result.stderr}")
+        return None
+    return json.loads(result.stdout)
+
+def estimated_size(fmt, duration=None):
+    """Bytes for a format: exact or approximate filesize, else bitrate x duration; None if unknown"""
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    if size:
+        return size
+    if fmt.get("tbr") and duration:
+        # tbr is in kbit/s
+        return int(fmt["tbr"] * 1000 / 8 * duration)
+    return None
+
+def choose_format(formats, min_height, duration=None):
+    """
+    Pick the smallest video-only format at least `min_height` pixels tall.
+
+    Audio-only, muxed and storyboard formats are ignored. Formats are ranked by
+    estimated size, then height and bitrate. If nothing is tall enough, the
+    tallest video-only formats are used instead. Returns the format dict or None.
+    """
+    video_only = [f for f in formats
+                  if f.get("vcodec") not in (None, "none") and f.get("acodec") == "none" and f.get("height")]
+    if not video_only:
+        return None
+
+    candidates = [f for f in video_only if f["height"] >= min_height]
+    if not candidates:
+        tallest = max(f["height"] for f in video_only)
+        print(f"No video-only format is {min_height}p or taller; using {tallest}p")
+        candidates = [f for f in video_only if f["height"] == tallest]
+
+    def rank(fmt):
+        size = estimated_size(fmt, duration)
+        # Unknown sizes sort after known ones
+        return (size is None, size or 0, fmt["height"], fmt.get("tbr") or 0)
+
+    return min(candidates, key=rank)
+
+def parse_timestamp(value):
+    """Seconds from "90", "1:30" or "1:02:30" """
+    seconds = 0.0
+    for part in value.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def parse_section(value):
+    """argparse type for START-END time ranges; returns (start_seconds, end_seconds)"""
+    try:
+        start, end = value.split("-")
+        start, end = parse_timestamp(start), parse_timestamp(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid time range '{value}' (use START-END, e.g. 90-150 or 1:30-2:30)")
+    if end <= start:
+        raise argparse.ArgumentTypeError(f"Time range '{value}' ends before it starts")
+    return start, end
+
+def download_with_ytdlp(video_url, format_code=None, cookies_file=None, sections=None, min_height=None,
+                        exact_cuts=False):
+    """
+    Download a video (or only some time ranges of it) with yt-dlp.
+
+    Args:
+        video_url: YouTube video URL
+        format_code: yt-dlp format code (default: best, or see min_height)
+        cookies_file: Cookies file for authentication
+        sections: (start_seconds, end_seconds) ranges to download; each becomes its own file
+        min_height: Choose the smallest video-only format at least this tall (no audio)
+        exact_cuts: Re-encode at the section cuts so they're frame-exact instead of keyframe-aligned
+    """
     try:
         # Check if yt-dlp is installed
         try:
@@ -65,6 +149,9 @@ def download_with_ytdlp(video_url, format_code=None, cookies_file=None):
         # %(channel)s = YouTube channel name
         # We add the current date/time manually since we want the current time, not upload time
         filename_template = f"%(channel)s_{current_time}.%(ext)s"
+        if sections:
+            # One file per section, named by its start time in seconds
+            filename_template = f"%(channel)s_{current_time}_%(section_start)d.%(ext)s"
         
         # Clean up the filename to remove invalid characters
         filename_template = re.sub(r'[\\/*?:"<>|]', "_", filename_template)
@@ -81,6 +168,28 @@ def download_with_ytdlp(video_url, format_code=None, cookies_file=None):
         if cookies_file:
             command.extend(["--cookies", cookies_file])
         
+        # Pick the smallest video-only format that is tall enough
+        if min_height and not format_code:
+            info = fetch_video_info(video_url, cookies_file)
+            duration = info.get("duration") if info else None
+            chosen = choose_format(info.get("formats", []), min_height, duration) if info else None
+            if chosen is None:
+                print(f"No video-only format found; falling back to yt-dlp's smallest video at {min_height}p or more")
+                # A sort instead of a [height>=N] filter: cmd.exe would treat ">" as a redirection
+                format_code = "bv"
+                command.extend(["-S", f"+res:{min_height},+size,+br"])
+            else:
+                format_code = chosen["format_id"]
+                size = estimated_size(chosen, duration)
+                print(f"Chose format {format_code}: {chosen['height']}p {chosen.get('ext', '')} video only"
+                      + (f", ~{size / 1024 / 1024:.1f} MB" if size else ""))
+
+        # Only fetch the requested time ranges
+        for start, end in sections or []:
+            command.extend(["--download-sections", f"*{start:g}-{end:g}"])
+        if sections and exact_cuts:
+            command.append("--force-keyframes-at-cuts")
+
         # Add format code if specified
         if format_code:
             command.extend(["-f", format_code])
@@ -95,6 +204,8 @@ def download_with_ytdlp(video_url, format_code=None, cookies_file=None):
             print(f"Format selected: {format_code}")
         else:
             print("Format selected: best available quality")
+        for start, end in sections or []:
+            print(f"Section: {start:g}s to {end:g}s")
             
         print("Starting download...")
         
@@ -130,8 +241,17 @@ def main():
     parser.add_argument('--list', action='store_true', help='List available formats')
     parser.add_argument('--format', '-f', help='Format code to download')
     parser.add_argument('--cookies', '-c', help='Path to cookies file for authentication')
+    parser.add_argument('--section', type=parse_section, action='append', dest='sections',
+                        help='Only download this time range, START-END in seconds or [HH:]MM:SS (repeatable; '
+                             'each range is saved as its own file and needs ffmpeg)')
+    parser.add_argument('--exact-cuts', action='store_true',
+                        help='Re-encode at --section cuts so they are frame-exact (default: cut at keyframes)')
+    parser.add_argument('--min-height', type=int,
+                        help='Download the smallest video-only format at least this many pixels tall (no audio)')
     
     args = parser.parse_args()
+    if args.format and args.min_height:
+        parser.error("--format and --min-height are mutually exclusive")
     
     # Check if the URL is valid
     if not re.match(r'^(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+$', args.url):
@@ -149,7 +269,7 @@ def main():
         return
     
     # Download the video
-    download_with_ytdlp(args.url, args.format, cookies_file)
+    download_with_ytdlp(args.url, args.format, cookies_file, args.sections, args.min_height, args.exact_cuts)
 
 if __name__ == "__main__":
     main()
@@ -1,36 +1,50 @@
 ﻿import argparse
-from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+import os
+import sys
 from PIL import Image
 
-def extract_text_from_image(image_path: str, model_name: str = "microsoft/trocr-base-printed") -> str:
-    # Load the processor and model
-    processor = TrOCRProcessor.from_pretrained(model_name)
-    model = VisionEncoderDecoderModel.from_pretrained(model_name)
-    
-    # Open the image file and convert it to RGB
-    image = Image.open(image_path).convert("RGB")
-    
-    # Process the image to get pixel values
-    pixel_values = processor(image, return_tensors="pt").pixel_values
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "VideoConsole"))
+from ocr_utils import OCRProcessor, BACKENDS
+
+def load_ocr(model_name: str, backend: str = "torch") -> OCRProcessor:
+    # Uses the warm OCR service (VideoConsole/ocr_service.py) when it's running,
+    # otherwise loads the processor and model in-process
+    ocr = OCRProcessor(model_name, backend=backend)
+    ocr.load_thread.join()
+    if not ocr.model_loaded:
+        raise RuntimeError(f"Could not load model {model_name}")
+    return ocr
+
+def extract_text_from_images(image_paths: list, model_name: str = "microsoft/trocr-base-printed",
+                             backend: str = "torch") -> list:
+    ocr = load_ocr(model_name, backend)
     
-    # Generate predicted token ids
-    generated_ids = model.generate(pixel_values)
+    # Open the image files and convert them to RGB
+    images = [Image.open(image_path).convert("RGB") for image_path in image_paths]
     
-    # Decode the token ids to text
-    generated_text = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-    return generated_text
+    # Recognize all images in one batch
+    return ocr.extract_text_batch(images)
+
+def extract_text_from_image(image_path: str, model_name: str = "microsoft/trocr-base-printed",
+                            backend: str = "torch") -> str:
+    return extract_text_from_images([image_path], model_name, backend)[0]
 
 def main():
-    parser = argparse.ArgumentParser(description="Extract text from an image using the TrOCR model.")
-    parser.add_argument("image_path", type=str, help="Path to the image file to be processed.")
+    parser = argparse.ArgumentParser(description="Extract text from images using the TrOCR model.")
+    parser.add_argument("image_paths", type=str, nargs="+", help="Path(s) to the image file(s) to be processed.")
     parser.add_argument("--model", type=str, default="microsoft/trocr-base-printed", 
                         help="Model name to use (default: microsoft/trocr-base-printed).")
+    parser.add_argument("--backend", type=str, choices=BACKENDS, default="torch",
+                        help="Run the model with PyTorch or onnxruntime (default: torch).")
     
     args = parser.parse_args()
     
-    extracted_text = extract_text_from_image(args.image_path, args.model)
-    print("Extracted Text:")
-    print(extracted_text)
+    extracted_texts = extract_text_from_images(args.image_paths, args.model, args.backend)
+    for image_path, extracted_text in zip(args.image_paths, extracted_texts):
+        if len(args.image_paths) > 1:
+            print(f"{image_path}:")
+        print("Extracted Text:")
+        print(extracted_text)
 
 if __name__ == "__main__":
     main()
@@ -1,40 +1,183 @@
 import cv2
-import pytesseract
 import os
+import sys
 import argparse
 import numpy as np
 from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_text_from_video(video_path, output_file, duration_seconds=10, frame_step=12, start_offset=0):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "VideoConsole"))
+from frame_source import DECODERS, FrameSampler, open_video
+from pyav_capture import KeyframeSampler
+from ocr_cache import OCRCache
+from regions import crop_regions, load_regions
+from result_writers import OUTPUT_FORMATS, create_writer, format_for_path
+from ocr_engines import ENGINES, create_engine
+
+FRAMES_DIR = "extracted_frames"
+
+def split_segments(frames_to_process, frame_step, workers):
+    """
+    Split [0, frames_to_process) into contiguous segments for the workers.
+
+    Segment boundaries fall on sampled frames, so every worker samples the same
+    frames the serial loop would (every 'frame_step' frames from the start).
+
+    Returns a list of (first_frame, end_frame) pairs relative to the start frame.
+    """
+    sampled = list(range(0, frames_to_process, frame_step))
+    if not sampled:
+        return []
+
+    workers = max(1, min(workers, len(sampled)))
+    per_worker, remainder = divmod(len(sampled), workers)
+
+    segments = []
+    index = 0
+    for i in range(workers):
+        count = per_worker + (1 if i < remainder else 0)
+        first = sampled[index]
+        index += count
+        end = sampled[index] if index < len(sampled) else frames_to_process
+        segments.append((first, end))
+    return segments
+
+def recognize_cached(engine, image, cache, namespace):
+    """Run the engine on an image, reading and filling the OCR cache if there is one"""
+    if cache:
+        cache_key = cache.make_key(image, namespace)
+        ocr_result = cache.get(cache_key)
+        if ocr_result is not None:
+            return ocr_result
+
+    ocr_result = engine.recognize(image)
+    if cache:
+        cache.put(cache_key, ocr_result)
+    return ocr_result
+
+def iter_segment_results(video_path, start_frame, fps, segment, frame_step, engine, frames_dir=FRAMES_DIR, seek_mode="auto",
+                         cache_path=None, regions=None, decoder="cv2", keyframes_only=False):
+    """
+    OCR one segment of the video, yielding a result dict per sampled frame.
+
+    Opens its own capture and seeks once, so segments can run in separate processes.
+    Skipped frames are only grabbed, never retrieved (see FrameSampler).
+    With `regions` ({SelectionType: (x1, y1, x2, y2)}) only those crops are OCR'd,
+    one word per region. With `keyframes_only` (PyAV) only keyframes at least
+    `frame_step` frames apart are decoded and OCR'd.
+    """
+    first, end = segment
+    video = open_video(video_path, decoder, keyframes_only)
+    if not video.isOpened():
+        print(f"Error: Could not open video {video_path}")
+        return
+
+    if keyframes_only:
+        sampler = KeyframeSampler(video, start_frame + first, start_frame + end, frame_step)
+    else:
+        sampler = FrameSampler(video, start_frame + first, start_frame + end, frame_step, seek_mode)
+    cache = OCRCache(cache_path) if cache_path else None
+    namespace = engine.cache_namespace() if cache else None
+
+    try:
+        for frame_number, frame in sampler:
+            frame_count = frame_number - start_frame
+            result = {
+                'frame': frame_count,
+                'timestamp': timedelta(seconds=frame_count/fps),
+                'filename': os.path.join(frames_dir, f"frame_{frame_count:06d}.jpg"),
+                'words': [],
+                'error': None
+            }
+
+            # Save the frame as image
+            cv2.imwrite(result['filename'], frame)
+
+            # Extract text using the OCR engine
+            try:
+                if regions is not None:
+                    # Only the configured regions, each read as a single line
+                    for sel_type, crop in crop_regions(frame, regions).items():
+                        ocr_result = recognize_cached(engine, crop, cache, namespace)
+                        x1, y1, x2, y2 = regions[sel_type]
+                        result['words'].append({'region': sel_type.name, 'text': ocr_result['text'],
+                                                'conf': ocr_result['conf'], 'x': x1, 'y': y1, 'w': x2 - x1, 'h': y2 - y1})
+                else:
+                    # Get text with positioning data (from the cache if this frame was seen before)
+                    ocr_result = recognize_cached(engine, frame, cache, namespace)
+                    result['words'] = ocr_result['words']
+                    if not result['words'] and ocr_result['text']:
+                        # Engines without boxes read the whole frame as one line
+                        frame_h, frame_w = frame.shape[:2]
+                        result['words'] = [{'text': ocr_result['text'], 'conf': ocr_result['conf'],
+                                            'x': 0, 'y': 0, 'w': frame_w, 'h': frame_h}]
+            except Exception as e:
+                result['error'] = str(e)
+
+            yield result
+    finally:
+        video.release()
+        print(f"Frames {first}-{end}: {sampler.summary()}")
+        if cache:
+            print(f"Frames {first}-{end}: {cache.summary()}")
+            cache.close()
+
+def load_engine(engine_name):
+    """Create and load an OCR engine by name; None if it can't run"""
+    engine = create_engine(engine_name)
+    return engine if engine.load() else None
+
+def process_segment(video_path, start_frame, fps, segment, frame_step, engine_name="tesseract", seek_mode="auto",
+                    cache_path=None, regions=None, decoder="cv2", keyframes_only=False):
+    """Worker entry point: OCR a whole segment and return its results in frame order"""
+    # Each worker process loads its own engine
+    engine = load_engine(engine_name)
+    if engine is None:
+        raise RuntimeError(f"OCR engine {engine_name} could not be loaded in worker")
+    results = list(iter_segment_results(video_path, start_frame, fps, segment, frame_step, engine,
+                                        seek_mode=seek_mode, cache_path=cache_path, regions=regions,
+                                        decoder=decoder, keyframes_only=keyframes_only))
+    print(f"Worker finished frames {segment[0]}-{segment[1]} ({len(results)} frames processed)")
+    return results
+
+def extract_text_from_video(video_path, output_file, duration_seconds=10, frame_step=12, start_offset=0, workers=1, seek_mode="auto",
+                            cache_path=None, engine_name="tesseract", regions=None, output_format=None, decoder="cv2",
+                            keyframes_only=False):
     """
     Extract text from video frames, processing one frame every 'frame_step' frames
     for the specified duration in seconds.
-    
+
     Args:
         video_path: Path to the video file
         output_file: Path to save the extracted text
         duration_seconds: Process only X seconds of video
         frame_step: Process one frame every X frames
         start_offset: Start processing from this time offset in seconds
+        workers: Number of processes OCRing contiguous segments in parallel
+        seek_mode: How to skip unsampled frames: "grab", "seek" or "auto" (cheapest)
+        cache_path: OCR result cache file shared across runs (None to disable)
+        engine_name: Registered OCR engine to use (see ocr_engines.ENGINES)
+        regions: Only OCR these {SelectionType: (x1, y1, x2, y2)} regions instead of whole frames
+        output_format: "text", "jsonl" or "parquet" (default: from the output file extension)
+        decoder: "cv2" (OpenCV) or "pyav" (threaded FFmpeg decoding with exact seeks)
+        keyframes_only: Decode only keyframes, at least frame_step apart (pyav only)
     """
     # Check if video file exists
     if not os.path.isfile(video_path):
         print(f"Error: Video file {video_path} not found")
         return
 
-    # Check if pytesseract is properly installed
-    
-    pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
-    try:
-        pytesseract.get_tesseract_version()
-    except pytesseract.TesseractNotFoundError:
-        print("Error: Tesseract OCR not found. Please install it and ensure it's in your PATH.")
-        print("Installation guide: https://github.com/tesseract-ocr/tesseract")
+    # Check that the OCR engine is properly installed
+    engine = load_engine(engine_name)
+    if engine is None:
         return
 
     # Open the video file
-    video = cv2.VideoCapture(video_path)
+    try:
+        video = open_video(video_path, decoder, keyframes_only)
+    except ImportError as e:
+        print(f"Error: {str(e)}")
+        return
     if not video.isOpened():
         print(f"Error: Could not open video {video_path}")
         return
@@ -42,96 +185,97 @@ def extract_text_from_video(video_path, output_file, duration_seconds=10, frame_
     # Get video properties
     fps = video.get(cv2.CAP_PROP_FPS)
     total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
-    
+    video.release()
+
     # Calculate start frame and frames to process based on offset and duration
     start_frame = int(fps * start_offset)
     frames_to_process = min(int(fps * duration_seconds), total_frames - start_frame)
-    
+
     print(f"Video FPS: {fps}")
     print(f"Starting at offset: {start_offset} seconds (frame {start_frame})")
     print(f"Processing {frames_to_process} frames ({duration_seconds} seconds of video)")
-    print(f"Taking 1 frame every {frame_step} frames")
-    
-    # Set video position to start frame
-    video.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-    
+    if keyframes_only:
+        print(f"Taking keyframes at least {frame_step} frames apart")
+    else:
+        print(f"Taking 1 frame every {frame_step} frames")
+
     # Create directory for frames if needed
-    frames_dir = "extracted_frames"
-    os.makedirs(frames_dir, exist_ok=True)
-    
+    os.makedirs(FRAMES_DIR, exist_ok=True)
+
+    segments = split_segments(frames_to_process, frame_step, workers)
+
     # Open output file for writing
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(f"Video Text Extraction Results for {os.path.basename(video_path)}\n")
-        f.write(f"Processing {duration_seconds} seconds starting at {start_offset} seconds, one frame every {frame_step} frames\n")
-        f.write("=" * 80 + "\n\n")
-        
-        frame_count = 0
+    try:
+        writer = create_writer(output_format or format_for_path(output_file), output_file, [
+            f"Video Text Extraction Results for {os.path.basename(video_path)}",
+            f"Processing {duration_seconds} seconds starting at {start_offset} seconds, one frame every {frame_step} frames"
+        ])
+    except ImportError as e:
+        print(f"Error: {str(e)}")
+        return
+    try:
         processed_count = 0
-        
-        while frame_count < frames_to_process:
-            ret, frame = video.read()
-            
-            if not ret:
-                break
-                
-            # Process every Nth frame
-            if frame_count % frame_step == 0:
-                timestamp = timedelta(seconds=frame_count/fps)
-                frame_filename = os.path.join(frames_dir, f"frame_{frame_count:06d}.jpg")
-                
-                # Save the frame as image
-                cv2.imwrite(frame_filename, frame)
-                
-                # Extract text using pytesseract
-                try:
-                    # Get text with positioning data
-                    data = pytesseract.image_to_data(frame, output_type=pytesseract.Output.DICT)
-                    
-                    # Write frame header to file
-                    f.write(f"Frame {frame_count} (Time: {timestamp})\n")
-                    f.write(f"Image saved as: {frame_filename}\n")
-                    
-                    # Filter out empty text
-                    text_found = False
-                    
-                    for i in range(len(data['text'])):
-                        # Skip empty text
-                        if not data['text'][i].strip():
-                            continue
-                            
-                        text_found = True
-                        x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-                        conf = data['conf'][i]
-                        text = data['text'][i]
-                        
-                        # Write text and position data to file
-                        f.write(f"  Text: '{text}' (Confidence: {conf}%)\n")
-                        f.write(f"  Position: x={x}, y={y}, width={w}, height={h}\n")
-                        
-                    if not text_found:
-                        f.write("  No text detected in this frame.\n")
-                        
-                    f.write("\n" + "-" * 40 + "\n\n")
-                    
-                except Exception as e:
-                    f.write(f"  Error processing frame: {str(e)}\n\n")
-                
-                processed_count += 1
-                print(f"Processed frame {frame_count}/{frames_to_process} ({processed_count} total frames processed)")
-                
-            frame_count += 1
-                
-    video.release()
+
+        if len(segments) <= 1:
+            for segment in segments:
+                for result in iter_segment_results(video_path, start_frame, fps, segment, frame_step, engine,
+                                                   seek_mode=seek_mode, cache_path=cache_path, regions=regions,
+                                                   decoder=decoder, keyframes_only=keyframes_only):
+                    writer.write(result)
+                    processed_count += 1
+                    print(f"Processed frame {result['frame']}/{frames_to_process} ({processed_count} total frames processed)")
+        else:
+            print(f"Splitting work across {len(segments)} worker processes")
+            with ProcessPoolExecutor(max_workers=len(segments)) as executor:
+                futures = [
+                    executor.submit(process_segment, video_path, start_frame, fps, segment, frame_step, engine_name, seek_mode,
+                                    cache_path, regions, decoder, keyframes_only)
+                    for segment in segments
+                ]
+
+                # Segments are contiguous, so writing them in submission order keeps frame order
+                for segment, future in zip(segments, futures):
+                    for result in future.result():
+                        writer.write(result)
+                        processed_count += 1
+                    print(f"Merged frames {segment[0]}-{segment[1]}/{frames_to_process} ({processed_count} total frames processed)")
+    finally:
+        writer.close()
+
     print(f"Processing complete. Results saved to {output_file}")
-    print(f"Extracted frames saved to {frames_dir}/ directory")
+    print(f"Extracted frames saved to {FRAMES_DIR}/ directory")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract text from video frames")
     parser.add_argument("video_path", help="Path to the video file")
-    parser.add_argument("--output", default="video_text_extraction.txt", help="Output text file path")
+    parser.add_argument("--output", default="video_text_extraction.txt",
+                        help="Output file path (.jsonl and .parquet choose those formats)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="Output format: text report, JSON Lines per frame, or Parquet rows per word "
+                             "(default: from the --output extension)")
     parser.add_argument("--duration", type=int, default=10, help="Process N seconds of video (default: 10)")
     parser.add_argument("--step", type=int, default=12, help="Process one frame every N frames (default: 12)")
     parser.add_argument("--offset", type=int, default=0, help="Start at N seconds into the video (default: 0)")
-    
+    parser.add_argument("--workers", type=int, default=1, help="OCR N contiguous segments in parallel processes (default: 1)")
+    parser.add_argument("--seek", choices=FrameSampler.SEEK_MODES, default="auto",
+                        help="Skip unsampled frames by grabbing, seeking, or whichever is cheaper (default: auto)")
+    parser.add_argument("--cache", default="ocr_cache.sqlite",
+                        help="OCR result cache shared across runs (default: ocr_cache.sqlite)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the OCR result cache")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        help="OCR engine (default: tesseract, or tesseract-line with --regions; "
+                             "set TESSERACT_CMD to locate the binary)")
+    parser.add_argument("--regions", help="Only OCR the regions in this JSON file (saved from the Video Text Player)")
+    parser.add_argument("--decoder", choices=DECODERS, default="cv2",
+                        help="Video decoder: OpenCV, or PyAV with threaded decoding and exact seeks (default: cv2)")
+    parser.add_argument("--keyframes-only", action="store_true",
+                        help="Decode only keyframes at least --step frames apart, for very coarse sampling (needs --decoder pyav)")
+
     args = parser.parse_args()
-    extract_text_from_video(args.video_path, args.output, args.duration, args.step, args.offset)
+    if args.keyframes_only and args.decoder != "pyav":
+        parser.error("--keyframes-only needs --decoder pyav")
+    regions = load_regions(args.regions) if args.regions else None
+    engine_name = args.engine or ("tesseract-line" if regions else "tesseract")
+    extract_text_from_video(args.video_path, args.output, args.duration, args.step, args.offset, args.workers, args.seek,
+                            None if args.no_cache else args.cache, engine_name, regions, args.format, args.decoder,
+                            args.keyframes_only)
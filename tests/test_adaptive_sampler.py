@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VideoConsole"))
+from adaptive_sampler import AdaptiveSampler
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in whose frames are their own frame numbers.
+
+    `seek_error` shifts where CAP_PROP_POS_FRAMES seeks land (except to
+    frame 0), like a container with inexact position seeking.
+    """
+
+    def __init__(self, frame_count, seek_error=0):
+        self.frame_count = frame_count
+        self.seek_error = seek_error
+        self.position = 0
+        self.current = None
+
+    def set(self, prop, value):
+        value = int(value)
+        self.position = value if value == 0 else max(0, value + self.seek_error)
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        return 0
+
+    def grab(self):
+        if self.position >= self.frame_count:
+            return False
+        self.current = self.position
+        self.position += 1
+        return True
+
+    def retrieve(self):
+        return True, self.current
+
+def values_changing_at(changes):
+    """read_values callback whose value is the number of changes at or before the frame"""
+    def read_values(frame_number, frame):
+        assert frame == frame_number, f"asked for frame {frame_number}, decoded {frame}"
+        return {"value": sum(1 for change in changes if change <= frame_number)}
+    return read_values
+
+class AdaptiveSamplerTest(unittest.TestCase):
+    def run_sampler(self, changes, frame_count=1000, start_frame=0, end_frame=None, seek_error=0, **kwargs):
+        end_frame = frame_count if end_frame is None else end_frame
+        sampler = AdaptiveSampler(FakeCapture(frame_count, seek_error), start_frame, end_frame,
+                                  values_changing_at(changes), **kwargs)
+        return [frame_number for frame_number, _ in sampler], sampler
+
+    def test_finds_each_change_exactly(self):
+        found, sampler = self.run_sampler([200, 517, 640], step=15, max_step=240)
+        self.assertEqual(found, [0, 200, 517, 640])
+        self.assertEqual(sampler.changes, 3)
+        self.assertLess(sampler.ocr_calls, 100)
+
+    def test_change_in_first_interval(self):
+        found, _ = self.run_sampler([1, 9], step=15)
+        self.assertEqual(found, [0, 1, 9])
+
+    def test_change_in_last_interval(self):
+        found, _ = self.run_sampler([990, 999], step=15, max_step=240)
+        self.assertEqual(found, [0, 990, 999])
+
+    def test_start_offset(self):
+        found, _ = self.run_sampler([350, 420], start_frame=300, end_frame=500, step=10)
+        self.assertEqual(found, [300, 350, 420])
+
+    def test_min_step_limits_precision(self):
+        found, _ = self.run_sampler([517], step=16, max_step=16, min_step=4)
+        self.assertEqual(len(found), 2)
+        self.assertTrue(517 <= found[1] < 517 + 4)
+
+    def test_inexact_seeks_are_corrected(self):
+        for seek_error in (-3, 5):
+            found, sampler = self.run_sampler([200, 517, 999], step=15, max_step=240, seek_error=seek_error)
+            self.assertEqual(found, [0, 200, 517, 999])
+            self.assertGreater(sampler.inexact_seeks, 0)
+
+if __name__ == "__main__":
+    unittest.main()
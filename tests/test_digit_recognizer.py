@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VideoConsole"))
+from digit_recognizer import DigitRecognizer
+
+# Lit segments per digit: a top, b/c upper/lower right, d bottom, e/f lower/upper left, g middle
+SEGMENTS = {"0": "abcdef", "1": "bc", "2": "abdeg", "3": "abcdg", "4": "bcfg",
+            "5": "acdfg", "6": "acdefg", "7": "abc", "8": "abcdefg", "9": "abcdfg"}
+
+def render(text, width=18, height=32, stroke=4, gap=8, jpeg_quality=None):
+    """Seven-segment display crop, where digits like 8 and 9 differ by a single segment"""
+    image = np.zeros((height + 2 * gap, gap + len(text) * (width + gap), 3), dtype=np.uint8)
+    for i, character in enumerate(text):
+        x, y = gap + i * (width + gap), gap
+        boxes = {
+            "a": (x, y, x + width, y + stroke),
+            "b": (x + width - stroke, y, x + width, y + height // 2),
+            "c": (x + width - stroke, y + height // 2, x + width, y + height),
+            "d": (x, y + height - stroke, x + width, y + height),
+            "e": (x, y + height // 2, x + stroke, y + height),
+            "f": (x, y, x + stroke, y + height // 2),
+            "g": (x, y + (height - stroke) // 2, x + width, y + (height + stroke) // 2),
+        }
+        for segment in SEGMENTS[character]:
+            x1, y1, x2, y2 = boxes[segment]
+            cv2.rectangle(image, (x1, y1), (x2 - 1, y2 - 1), (255, 255, 255), -1)
+    if jpeg_quality is not None:
+        image = cv2.imdecode(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])[1], 1)
+    return image
+
+class DigitRecognizerTest(unittest.TestCase):
+    def trained(self, texts, min_samples=3):
+        recognizer = DigitRecognizer(min_samples=min_samples)
+        for text in texts:
+            for _ in range(min_samples):
+                self.assertTrue(recognizer.learn(render(text), text))
+        return recognizer
+
+    def test_reads_learned_digits(self):
+        recognizer = self.trained(["0123456789"])
+        self.assertEqual(recognizer.recognize(render("1207", jpeg_quality=60)), "1207")
+        self.assertEqual(recognizer.fast, 1)
+
+    def test_confusable_digits_stay_apart(self):
+        recognizer = self.trained(["0123456789"])
+        for text in ("89", "98", "80", "86", "39", "8888"):
+            self.assertEqual(recognizer.recognize(render(text)), text)
+
+    def test_falls_back_without_templates(self):
+        recognizer = DigitRecognizer()
+        self.assertIsNone(recognizer.recognize(render("42")))
+        self.assertEqual(recognizer.fallbacks, 1)
+
+    def test_falls_back_on_glyph_without_template(self):
+        # '8' is one segment away from '9'; with no '8' template it must go to the model, not read as '9'
+        recognizer = self.trained(["9", "1"])
+        self.assertEqual(recognizer.recognize(render("919")), "919")
+        self.assertIsNone(recognizer.recognize(render("8")))
+        self.assertIsNone(recognizer.recognize(render("98")))
+        self.assertEqual(recognizer.fallbacks, 2)
+
+    def test_falls_back_on_undersampled_character(self):
+        recognizer = self.trained(["9"])
+        # One sample of '8' isn't a template yet, even though it matches exactly
+        recognizer.learn(render("8"), "8")
+        self.assertIsNone(recognizer.recognize(render("8")))
+
+    def test_mismatched_text_is_not_learned(self):
+        recognizer = DigitRecognizer()
+        self.assertFalse(recognizer.learn(render("12"), "123"))
+        self.assertEqual(recognizer.learned, 0)
+
+    def test_templates_round_trip_without_npz_suffix(self):
+        recognizer = self.trained(["0123456789"])
+        with tempfile.TemporaryDirectory() as directory:
+            recognizer.path = os.path.join(directory, "meter.templates")
+            recognizer.save()
+            self.assertEqual(os.listdir(directory), ["meter.templates"])
+            loaded = DigitRecognizer(recognizer.path)
+        self.assertEqual(loaded.recognize(render("4096")), "4096")
+
+if __name__ == "__main__":
+    unittest.main()